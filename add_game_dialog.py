@@ -138,7 +138,7 @@ class AddGameDialog(QDialog):
             field.setText(cropper.result_path)
 
     def _browse_sgdb(self, field, asset_type):
-        api_key   = settings_manager.load_settings().get("sgdb_api_key", "")
+        api_key   = settings_manager.get("sgdb_api_key", "")
         game_name = self.name_input.text().strip()
         dlg = SteamGridDBDialog(
             game_name=game_name,
@@ -0,0 +1,198 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QPixmap, QImageReader
+from artwork_cache import ArtworkCache, scaled_size, EXPAND
+import settings_manager, frame_clock, performance
+
+
+MIN_DELAY = 20     # ms — GIFs com delay 0/10 rodariam a 100 fps
+
+
+class SharedAnimation(QObject):
+    """
+    Um GIF decodificado uma única vez para um tamanho alvo.
+    Os frames já redimensionados ficam em memória (se couberem no orçamento
+    do serviço) e o frame avança pelo relógio global (frame_clock) para
+    todos os inscritos. Roda enquanto pelo menos um inscrito quiser
+    animação (set_playing).
+    """
+    frame_changed = pyqtSignal()
+
+    def __init__(self, service, key, path, w, h, dpr):
+        super().__init__(service)
+        self.key      = key
+        self._service = service
+        self._path    = path
+        self._size    = (w, h, dpr)
+        self._frames  = []        # [(QPixmap, delay_ms)] — cache completo do loop
+        self._cached  = False     # True depois do 1º loop completo em cache
+        self._stream  = False     # sem orçamento: decodifica frame a frame
+        self._reserved = 0        # bytes reservados no orçamento do serviço
+        self._index   = 0
+        self._current = QPixmap()
+        self._playing = set()     # tokens dos inscritos que querem animação
+        self._reader  = None
+        self._due     = 0         # instante (ms do relógio) do próximo frame
+        self._running = False     # inscrito no frame_clock
+        self._open_reader()
+        self._decode_next()       # 1º frame disponível mesmo pausado
+
+    # ── Decodificação ──────────────────────────────────────────────────────
+
+    def _open_reader(self):
+        w, h, dpr = self._size
+        self._reader = QImageReader(self._path)
+        size = scaled_size(self._reader.size(), w, h, dpr, EXPAND)
+        if size is not None:
+            self._reader.setScaledSize(size)
+        count = self._reader.imageCount()
+        if not self._frames and not self._stream and not self._reserved:
+            cost = size.width() * size.height() * 4 * count if size and count > 0 else 0
+            if cost and self._service.reserve(cost):
+                self._reserved = cost
+            else:
+                self._stream = True
+
+    def _decode_next(self):
+        """Lê o próximo frame do arquivo; reabre o reader ao fim do loop."""
+        img = self._reader.read()
+        if img.isNull():
+            if not self._stream and self._frames:
+                self._cached = True          # loop completo em memória
+                self._reader = None
+                self._index  = 0
+                self._current = self._frames[0][0]
+                return self._frames[0][1]
+            self._open_reader()
+            img = self._reader.read()
+            if img.isNull():
+                return None
+        img.setDevicePixelRatio(self._size[2])
+        delay = max(MIN_DELAY, self._reader.nextImageDelay())
+        self._current = QPixmap.fromImage(img)
+        if not self._stream:
+            self._frames.append((self._current, delay))
+        return delay
+
+    def tick(self, now):
+        """Chamado pelo frame_clock a cada quadro; False encerra a inscrição."""
+        if not self._playing:
+            self._running = False
+            return False
+        if now < self._due:
+            return True
+        if self._cached:
+            self._index   = (self._index + 1) % len(self._frames)
+            self._current, delay = self._frames[self._index]
+        else:
+            delay = self._decode_next()
+        self.frame_changed.emit()
+        if delay is None or len(self._frames) == 1:
+            self._running = False
+            return False
+        # Atrasado (FPS limitado): no máximo um frame por quadro do relógio
+        self._due = max(self._due + delay, now)
+        return True
+
+    # ── Inscritos ──────────────────────────────────────────────────────────
+
+    def current_pixmap(self):
+        return self._current
+
+    def set_playing(self, token, playing):
+        if playing:
+            self._playing.add(token)
+        else:
+            self._playing.discard(token)
+        clock = frame_clock.clock()
+        if self._playing and not self._running:
+            self._running = True
+            delay = self._frames[self._index][1] if self._cached else MIN_DELAY
+            self._due = clock.now() + delay
+            clock.add(self)
+        elif not self._playing and self._running:
+            self._running = False
+            clock.remove(self)
+
+    def rewind(self):
+        """Volta ao 1º frame (baixo consumo: GIFs parados no início do loop)."""
+        if self._cached:
+            self._index   = 0
+            self._current = self._frames[0][0]
+        else:
+            # Loop ainda não todo em memória (ou streaming): relê do começo
+            self._frames = []
+            self._open_reader()
+            self._decode_next()
+        self.frame_changed.emit()
+
+    def release_frames(self):
+        self._running = False
+        frame_clock.clock().remove(self)
+        self._service.unreserve(self._reserved)
+        self._reserved = 0
+        self._frames   = []
+
+
+class AnimationService(QObject):
+    """
+    Registro global de animações compartilhadas por (caminho, mtime,
+    tamanho alvo, DPR). N cards com o mesmo GIF custam o mesmo que um.
+    """
+    def __init__(self, budget_mb=64, parent=None):
+        super().__init__(parent)
+        self._anims  = {}     # chave → SharedAnimation
+        self._refs   = {}     # chave → nº de acquire() ativos
+        self._budget = budget_mb * 1024 * 1024
+        self._used   = 0
+
+    def acquire(self, path, w, h, dpr=1.0):
+        key = ArtworkCache.make_key(path, w, h, dpr, EXPAND)
+        if key is None:
+            return None
+        anim = self._anims.get(key)
+        if anim is None:
+            anim = self._anims[key] = SharedAnimation(self, key, path, w, h, dpr)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        return anim
+
+    def release(self, anim):
+        key = anim.key
+        self._refs[key] -= 1
+        if self._refs[key] <= 0:
+            del self._refs[key]
+            self._anims.pop(key, None)
+            anim.release_frames()
+            anim.deleteLater()
+
+    def reserve(self, nbytes):
+        """Reserva memória para o cache de frames; False se estourar o orçamento."""
+        if self._used + nbytes > self._budget:
+            return False
+        self._used += nbytes
+        return True
+
+    def unreserve(self, nbytes):
+        self._used = max(0, self._used - nbytes)
+
+    def set_budget(self, budget_mb):
+        self._budget = max(0, int(budget_mb)) * 1024 * 1024
+
+    def rewind_all(self):
+        for anim in self._anims.values():
+            anim.rewind()
+
+
+_service = None
+
+def service():
+    global _service
+    if _service is None:
+        _service = AnimationService(settings_manager.get("animation_cache_mb", 64))
+        settings_manager.notifier.changed.connect(_on_settings_changed)
+    return _service
+
+def _on_settings_changed(keys):
+    if "animation_cache_mb" in keys:
+        _service.set_budget(settings_manager.get("animation_cache_mb", 64))
+    if "performance_profile" in keys and not performance.animate():
+        _service.rewind_all()         # os cards já pausam; aqui voltam ao 1º frame
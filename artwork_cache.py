@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QPixmap, QImageReader
+import settings_manager, thumbnail_cache, math, os
+
+
+EXPAND = Qt.AspectRatioMode.KeepAspectRatioByExpanding
+FIT    = Qt.AspectRatioMode.KeepAspectRatio
+
+
+def scaled_size(src, w, h, dpr=1.0, aspect=EXPAND):
+    """Tamanho em pixels físicos de `src` (QSize) ajustado a w×h × dpr."""
+    if not src.isValid() or src.width() <= 0 or src.height() <= 0:
+        return None
+    tw, th = w * dpr, h * dpr
+    ratio  = (max if aspect == EXPAND else min)(tw / src.width(), th / src.height())
+    return QSize(max(1, math.ceil(src.width()  * ratio)),
+                 max(1, math.ceil(src.height() * ratio)))
+
+
+def decode_scaled(path, w, h, dpr=1.0, aspect=EXPAND):
+    """
+    Decodifica `path` direto no tamanho final (w×h lógicos × dpr) usando
+    QImageReader.setScaledSize — JPEGs são reduzidos já na decodificação.
+    Retorna QImage (seguro fora da thread da GUI); nula em caso de erro.
+    """
+    reader = QImageReader(path)
+    size = scaled_size(reader.size(), w, h, dpr, aspect)
+    if size is not None:
+        reader.setScaledSize(size)
+    img = reader.read()
+    if not img.isNull():
+        img.setDevicePixelRatio(dpr)
+    return img
+
+
+def load_scaled(key, path, w, h, dpr=1.0, aspect=EXPAND):
+    """
+    Como decode_scaled, mas passando pelo cache de miniaturas em disco:
+    lê a miniatura pronta se houver; senão decodifica o original e grava
+    a miniatura para a próxima vez. Seguro fora da thread da GUI.
+    """
+    img = thumbnail_cache.load(key)
+    if img.isNull():
+        img = decode_scaled(path, w, h, dpr, aspect)
+        if not img.isNull():
+            thumbnail_cache.store(key, img)
+    img.setDevicePixelRatio(dpr)
+    return img
+
+
+class ArtworkCache:
+    """
+    Cache LRU de arte já decodificada e redimensionada, compartilhado pelo
+    processo (cards, preview das configurações, cropper).
+    Chave: (caminho, mtime, tamanho do arquivo, tamanho alvo, DPR, modo) —
+    se o arquivo mudar no disco a chave muda e a entrada velha some pelo LRU.
+    """
+    def __init__(self, budget_mb=128):
+        self._items  = OrderedDict()   # chave → QPixmap
+        self._bytes  = 0
+        self._budget = budget_mb * 1024 * 1024
+
+    @staticmethod
+    def make_key(path, w, h, dpr=1.0, aspect=EXPAND):
+        """Monta a chave do cache; None se o arquivo não existir."""
+        try:
+            st = os.stat(path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return (os.path.normcase(os.path.abspath(path)), st.st_mtime_ns, st.st_size,
+                int(w), int(h), round(float(dpr), 2), aspect.value)
+
+    @staticmethod
+    def _cost(pix):
+        return pix.width() * pix.height() * max(1, pix.depth() // 8)
+
+    # ── Consulta / inserção ────────────────────────────────────────────────
+
+    def lookup(self, key):
+        pix = self._items.get(key)
+        if pix is not None:
+            self._items.move_to_end(key)
+        return pix
+
+    def insert(self, key, pix):
+        if key is None or pix is None or pix.isNull():
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= self._cost(old)
+        self._items[key] = pix
+        self._bytes     += self._cost(pix)
+        self._evict()
+
+    def get(self, path, w, h, dpr=1.0, aspect=EXPAND):
+        """
+        Retorna o QPixmap de `path` redimensionado para w×h (pontos lógicos)
+        na densidade `dpr`, decodificando só em caso de miss.
+        """
+        key = self.make_key(path, w, h, dpr, aspect)
+        if key is None:
+            return None
+        pix = self.lookup(key)
+        if pix is None:
+            img = load_scaled(key, path, w, h, dpr, aspect)
+            if img.isNull():
+                return None
+            pix = QPixmap.fromImage(img)
+            self.insert(key, pix)
+        return pix
+
+    # ── Orçamento ──────────────────────────────────────────────────────────
+
+    def set_budget(self, budget_mb):
+        self._budget = max(0, int(budget_mb)) * 1024 * 1024
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self._budget and self._items:
+            _, pix = self._items.popitem(last=False)
+            self._bytes -= self._cost(pix)
+
+
+_cache = ArtworkCache(settings_manager.get("artwork_cache_mb", 128))
+
+def cache():
+    """Instância global do cache de arte."""
+    return _cache
+
+def get_pixmap(path, w, h, dpr=1.0, aspect=EXPAND):
+    return _cache.get(path, w, h, dpr, aspect)
+
+def _on_settings_changed(keys):
+    if "artwork_cache_mb" in keys:
+        _cache.set_budget(settings_manager.get("artwork_cache_mb", 128))
+
+settings_manager.notifier.changed.connect(_on_settings_changed)
@@ -0,0 +1,147 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap, QImage
+from artwork_cache import load_scaled, EXPAND
+import artwork_cache, threading
+
+
+class _DecodeSignals(QObject):
+    done = pyqtSignal(object, QImage)
+
+
+class _DecodeTask(QRunnable):
+    """
+    Um worker do pool: na hora de rodar pega o pedido pendente de maior
+    prioridade *atual* (ArtworkLoader._take), decodifica (ou lê a miniatura
+    já pronta do disco) e devolve um QImage. Se não sobrou pedido (todos
+    cancelados), não faz nada.
+    """
+    def __init__(self, loader, signals):
+        super().__init__()
+        self.loader  = loader
+        self.signals = signals
+        self.setAutoDelete(True)
+
+    def run(self):
+        job = self.loader._take()
+        if job is None:
+            return
+        key, args = job
+        try:
+            img = load_scaled(key, *args)
+        except Exception:
+            img = QImage()
+        self.signals.done.emit(key, img)
+
+
+class ArtworkLoader(QObject):
+    """
+    Decodificação assíncrona de arte. request() responde na hora se a arte
+    já está no cache; senão enfileira o pedido (pedidos iguais são
+    agrupados) e chama o callback na thread da GUI quando ficar pronto.
+    Prioridade maior = decodificada antes (cards visíveis primeiro).
+
+    A fila é do loader, não do QThreadPool: cada worker escolhe o pedido
+    só quando começa a rodar, então a prioridade pode mudar depois do
+    pedido. Pedidos com `owner` somam a prioridade dele (set_priority) —
+    a LibraryView rebaixa os cards que saíram da tela ao rolar — e
+    cancel(owner) descarta os que ninguém mais espera.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self._signals = _DecodeSignals()
+        self._signals.done.connect(self._on_done)
+        self._lock    = threading.Lock()
+        self._queued  = {}     # chave → pedido ainda não iniciado
+        self._running = {}     # chave → pedido em decodificação
+        self._owners  = {}     # owner → prioridade base
+        self._seq     = 0      # desempate: o pedido mais novo primeiro
+
+    def request(self, path, w, h, dpr, callback, priority=0, aspect=EXPAND, owner=None):
+        """
+        callback(QPixmap | None). Retorna True se respondeu de forma síncrona.
+        Com `owner`, `priority` é relativa à prioridade base do owner.
+        """
+        cache = artwork_cache.cache()
+        key   = cache.make_key(path, w, h, dpr, aspect)
+        if key is None:
+            callback(None)
+            return True
+        pix = cache.lookup(key)
+        if pix is not None:
+            callback(pix)
+            return True
+        waiter = (owner, callback, priority)
+        with self._lock:
+            self._seq += 1
+            job = self._queued.get(key) or self._running.get(key)
+            if job is not None:
+                job["waiters"].append(waiter)
+                job["seq"] = self._seq
+                return False
+            self._queued[key] = {"args": (path, w, h, dpr, aspect),
+                                 "waiters": [waiter], "seq": self._seq}
+        self.pool.start(_DecodeTask(self, self._signals))
+        return False
+
+    def set_priority(self, owner, priority):
+        """Prioridade base dos pedidos de `owner` (vale também para os já feitos)."""
+        with self._lock:
+            self._owners[owner] = priority
+
+    def cancel(self, owner):
+        """Esquece os callbacks de `owner`; pedidos sem ninguém esperando saem da fila."""
+        with self._lock:
+            self._owners.pop(owner, None)
+            for jobs in (self._queued, self._running):
+                for key, job in list(jobs.items()):
+                    job["waiters"] = [w for w in job["waiters"] if w[0] is not owner]
+                    if not job["waiters"] and jobs is self._queued:
+                        del jobs[key]
+
+    def _priority(self, job):
+        return max(self._owners.get(owner, 0) + prio if owner is not None else prio
+                   for owner, _, prio in job["waiters"])
+
+    def _take(self):
+        """Chamado pelos workers: tira da fila o pedido mais prioritário agora."""
+        with self._lock:
+            if not self._queued:
+                return None
+            key = max(self._queued,
+                      key=lambda k: (self._priority(self._queued[k]), self._queued[k]["seq"]))
+            job = self._running[key] = self._queued.pop(key)
+            return key, job["args"]
+
+    def _on_done(self, key, img):
+        # Conversão QImage → QPixmap só pode acontecer na thread da GUI
+        pix = None
+        if not img.isNull():
+            pix = QPixmap.fromImage(img)
+            artwork_cache.cache().insert(key, pix)
+        with self._lock:
+            job = self._running.pop(key, None)
+        for _, callback, _ in job["waiters"] if job else ():
+            try:
+                callback(pix)
+            except RuntimeError:       # widget destruído antes da arte chegar
+                pass
+
+
+_loader = None
+
+def loader():
+    global _loader
+    if _loader is None:
+        _loader = ArtworkLoader()
+    return _loader
+
+def request(path, w, h, dpr, callback, priority=0, aspect=EXPAND, owner=None):
+    return loader().request(path, w, h, dpr, callback, priority, aspect, owner)
+
+def set_priority(owner, priority):
+    loader().set_priority(owner, priority)
+
+def cancel(owner):
+    loader().cancel(owner)
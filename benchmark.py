@@ -0,0 +1,184 @@
+"""
+Micro-benchmarks do GameHub (não fazem parte do app).
+
+    python benchmark.py storage [n_jogos]
+    python benchmark.py vdf [n_manifests]
+
+Roda numa pasta temporária — os dados reais em AppData não são tocados.
+"""
+import os, sys, tempfile, time
+
+_TMP = tempfile.mkdtemp(prefix="gamehub_bench_")
+os.environ["APPDATA"] = _TMP      # precisa vir antes dos imports do app
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def _best(*fns, runs=7):
+    """
+    Melhor de `runs` execuções de cada função, intercaladas — para medidas
+    curtas, sensíveis a ruído, que vão ser comparadas entre si.
+    """
+    times = [[] for _ in fns]
+    for _ in range(runs):
+        for fn, t in zip(fns, times):
+            t.append(_timed(fn))
+    return [min(t) for t in times]
+
+
+def bench_storage(n=5000):
+    """Compara os backends JSON e SQLite do game_manager."""
+    import game_manager, settings_manager
+
+    print(f"Biblioteca com {n} jogos (ms)")
+    print(f"{'backend':<8} {'import':>9} {'load':>9} {'edit':>9} {'swap':>9} {'remove':>9}")
+    for name in ("json", "sqlite"):
+        for path in (game_manager.DATA_FILE, game_manager.DB_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+        settings_manager.save_settings(dict(settings_manager.DEFAULTS))
+        settings_manager.flush()
+
+        store = game_manager.GameStore(game_manager.make_backend(name))
+        items = ({"name": f"Jogo {i}", "exe_path": f"steam://rungameid/{i}"}
+                 for i in range(n))
+
+        def do_import():
+            store.add_many(items); store.flush()
+
+        def do_load():
+            game_manager.GameStore(game_manager.make_backend(name)).all()
+
+        t_import = _timed(do_import)
+        ids      = store.ids()
+        t_load   = _timed(do_load)
+        t_edit   = _timed(lambda: (store.update(ids[n // 2], name="Editado"),
+                                   store.flush()))
+
+        def do_swap():
+            order = store.ids()
+            order[0], order[-1] = order[-1], order[0]
+            store.set_order(order); store.flush(); settings_manager.flush()
+
+        t_swap   = _timed(do_swap)
+        t_remove = _timed(lambda: (store.delete(ids[1]), store.flush()))
+        print(f"{name:<8} {t_import:>9.1f} {t_load:>9.1f} {t_edit:>9.1f} "
+              f"{t_swap:>9.1f} {t_remove:>9.1f}")
+
+
+_ACF = """"AppState"
+{
+	"appid"		"%(appid)d"
+	"Universe"		"1"
+	"name"		"Jogo de Teste %(appid)d"
+	"StateFlags"		"4"
+	"installdir"		"Jogo%(appid)d"
+	"LastUpdated"		"17%(appid)08d"
+	"SizeOnDisk"		"%(size)d"
+	"buildid"		"%(appid)d"
+	"InstalledDepots"
+	{
+		"%(depot)d"
+		{
+			"manifest"		"71829302%(appid)d"
+			"size"		"%(size)d"
+		}
+	}
+	"UserConfig"
+	{
+		"language"		"brazilian"
+	}
+}
+"""
+
+
+def make_fake_steam(root, n, libraries=3, artwork=False):
+    """
+    Monta uma instalação Steam falsa em `root` com n manifests espalhados
+    por `libraries` bibliotecas (a padrão + extras no libraryfolders.vdf).
+    Com artwork=True também preenche appcache/librarycache, alternando o
+    layout antigo (arquivos soltos), o novo (pasta por appid, com subpasta
+    de hash) e apps sem arte.
+    """
+    libs = [root] + [os.path.join(root, f"lib{i}") for i in range(1, libraries)]
+    for lib in libs:
+        os.makedirs(os.path.join(lib, "steamapps"), exist_ok=True)
+    entries = []
+    for i, lib in enumerate(libs):
+        apps = "".join(f'\t\t\t"{a}"\t\t"{a * 1000}"\n'
+                       for a in range(10 + i, 10 + n, libraries))
+        entries.append(f'\t"{i}"\n\t{{\n\t\t"path"\t\t"{lib.replace(chr(92), chr(92) * 2)}"\n'
+                       f'\t\t"label"\t\t""\n\t\t"apps"\n\t\t{{\n{apps}\t\t}}\n\t}}\n')
+    with open(os.path.join(root, "steamapps", "libraryfolders.vdf"), "w", encoding="utf-8") as f:
+        f.write('"libraryfolders"\n{\n' + "".join(entries) + "}\n")
+    for k in range(n):
+        appid = 10 + k
+        lib   = libs[k % libraries]
+        with open(os.path.join(lib, "steamapps", f"appmanifest_{appid}.acf"), "w",
+                  encoding="utf-8") as f:
+            f.write(_ACF % {"appid": appid, "size": appid * 1000, "depot": appid + 1})
+    if artwork:
+        _make_librarycache(os.path.join(root, "appcache", "librarycache"), n)
+    return root
+
+
+def _make_librarycache(cache, n):
+    os.makedirs(cache, exist_ok=True)
+    for k in range(n):
+        appid = 10 + k
+        if k % 4 == 0:              # layout antigo
+            names = [f"{appid}_library_600x900.jpg", f"{appid}_library_hero.jpg",
+                     f"{appid}_header.jpg", f"{appid}_icon.jpg"]
+        elif k % 4 == 1:            # layout novo
+            names = [f"{appid}/library_600x900.jpg", f"{appid}/header.jpg",
+                     f"{appid}/logo.png"]
+        elif k % 4 == 2:            # layout novo com subpasta de hash
+            names = [f"{appid}/3f2a9c/library_600x900_2x.jpg",
+                     f"{appid}/3f2a9c/library_hero.jpg"]
+        else:                       # nunca aberto no cliente: sem arte
+            continue
+        for name in names:
+            path = os.path.join(cache, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "wb").close()
+
+
+def bench_vdf(n=5000):
+    """Tokenizer KeyValues vs. o antigo re.search por chave, a varredura completa e a arte local."""
+    import re, steam_scanner
+
+    def legacy(text):
+        def val(key):
+            m = re.search(rf'"{key}"\s+"([^"]+)"', text, re.IGNORECASE)
+            return m.group(1) if m else ""
+        return {k: val(k) for k in ("appid", "name", "installdir", "SizeOnDisk",
+                                    "LastUpdated", "StateFlags")}
+
+    root  = make_fake_steam(os.path.join(_TMP, "steam"), n, artwork=True)
+    texts = [_ACF % {"appid": 10 + k, "size": k, "depot": k} for k in range(n)]
+    t_regex, t_kv = _best(lambda: [legacy(t) for t in texts],
+                          lambda: [steam_scanner._parse_acf(t) for t in texts])
+    games   = []
+    t_scan  = _timed(lambda: games.extend(steam_scanner.scan_steam_games(root)))
+    art     = {}
+    t_art   = _timed(lambda: art.update(
+        steam_scanner.local_artwork((g["appid"] for g in games), root)))
+    libs    = steam_scanner.library_folders(root)
+    print(f"{n} manifests em {len(libs)} bibliotecas (ms)")
+    print(f"{'re.search/chave':<18} {t_regex:>9.1f}")
+    print(f"{'KeyValues':<18} {t_kv:>9.1f}")
+    print(f"{'scan completo':<18} {t_scan:>9.1f}   ({len(games)} jogos)")
+    print(f"{'arte local':<18} {t_art:>9.1f}   ({len(art)} com capa)")
+
+
+BENCHES = {"storage": bench_storage, "vdf": bench_vdf}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHES:
+        print(__doc__)
+        sys.exit(1)
+    BENCHES[sys.argv[1]](*[int(a) for a in sys.argv[2:]])
@@ -0,0 +1,79 @@
+from PyQt6.QtCore import Qt, QObject, QTimer, QElapsedTimer
+import settings_manager, performance
+
+
+class FrameClock(QObject):
+    """
+    Relógio único de animação do app.
+    Cada animação ativa (fade de hover, frames de GIF, wallpaper) se inscreve
+    com add() e recebe tick(agora_ms) a cada quadro; devolve False quando
+    terminou. Os widgets que mudaram pedem repaint com mark_dirty() e
+    recebem um único update() por quadro, depois de todas as animações
+    avançarem. O timer só roda enquanto houver algo animando.
+    """
+    def __init__(self, fps=60, parent=None):
+        super().__init__(parent)
+        self._animations = {}     # animação → None (conjunto ordenado)
+        self._dirty      = {}     # widget → None
+        self._elapsed    = QElapsedTimer()
+        self._elapsed.start()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.set_fps(fps)
+
+    # ── API ────────────────────────────────────────────────────────────────
+
+    def now(self):
+        """Milissegundos desde o início do relógio."""
+        return self._elapsed.elapsed()
+
+    def add(self, animation):
+        self._animations[animation] = None
+        self._ensure_running()
+
+    def remove(self, animation):
+        self._animations.pop(animation, None)
+
+    def mark_dirty(self, widget):
+        """Agenda o repaint do widget para o próximo quadro (um só por quadro)."""
+        self._dirty[widget] = None
+        self._ensure_running()
+
+    def set_fps(self, fps):
+        self._timer.setInterval(max(1, round(1000 / max(1, int(fps)))))
+
+    # ── Quadro ─────────────────────────────────────────────────────────────
+
+    def _ensure_running(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _tick(self):
+        now = self.now()
+        for animation in list(self._animations):
+            if not animation.tick(now):
+                self._animations.pop(animation, None)
+        dirty, self._dirty = self._dirty, {}
+        for widget in dirty:
+            try:
+                widget.update()
+            except RuntimeError:      # widget já destruído
+                pass
+        if not self._animations and not self._dirty:
+            self._timer.stop()
+
+
+_clock = None
+
+def clock():
+    """Instância global do relógio de animação."""
+    global _clock
+    if _clock is None:
+        _clock = FrameClock(performance.fps())
+        settings_manager.notifier.changed.connect(_on_settings_changed)
+    return _clock
+
+def _on_settings_changed(keys):
+    if keys & {"animation_fps", "performance_profile"}:
+        _clock.set_fps(performance.fps())
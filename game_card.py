@@ -1,21 +1,30 @@
 from PyQt6.QtWidgets import QWidget, QMenu
-from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, pyqtProperty, QEasingCurve, QRect, QRectF, QSize
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QPainterPath, QPen, QMovie
-import subprocess, os
+from PyQt6.QtCore import Qt, pyqtSignal, QEasingCurve, QRect, QRectF
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QPainterPath, QPen
+import os
+import settings_manager, artwork_loader, animation_service, frame_clock, performance, launcher
 
 
 CARD_W, CARD_H = 185, 275
+HOVER_MS = 220
+_HOVER_EASING = QEasingCurve(QEasingCurve.Type.OutCubic)
 
 
 class GameCard(QWidget):
     removed        = pyqtSignal(str)
     edit_requested = pyqtSignal(str)
     drag_moved     = pyqtSignal(str, object)
+    drag_finished  = pyqtSignal(str)
 
-    def __init__(self, game, parent=None):
+    def __init__(self, game, parent=None, priority=0):
         super().__init__(parent)
         self.game = game
+        artwork_loader.set_priority(self, priority)   # decodificação da arte
         self._hover_progress = 0.0
+        self._hover_fade     = None     # (de, para, início ms) enquanto anima
+        self._hovered        = False
+        self._anim_allowed   = True     # controlado pelo PlaybackGovernor
+        self._running        = False    # jogo aberto (LauncherService)
         self._dragging       = False
         self._drag_origin    = None
 
@@ -24,49 +33,121 @@ class GameCard(QWidget):
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self._context_menu)
 
-        self._icon_pix     = None
-        self._icon_movie   = None
-        self._banner_pix   = None
-        self._banner_movie = None
+        self._icon_pix    = None
+        self._icon_gif    = None
+        self._banner_pix  = None
+        self._banner_gif  = None
+        self._asset_paths = None
+        self._layers      = {}    # nome → ((chave, dpr), QPixmap) — ver _layer
+        self._load_assets()
 
-        self._load_asset(game.get("icon_path",   ""), is_banner=False)
-        self._load_asset(game.get("banner_path", ""), is_banner=True)
-
-        self._anim = QPropertyAnimation(self, b"hover_progress")
-        self._anim.setDuration(220)
-        self._anim.setEasingCurve(QEasingCurve.Type.OutCubic)
+        # Cor da borda resolvida uma vez; atualizada só quando o tema muda
+        self._border_color = QColor(settings_manager.get("card_border", "#6060cc"))
+        settings_manager.notifier.changed.connect(self._on_settings_changed)
 
     # ── Carregamento de assets (estático ou GIF) ───────────────────────────
 
+    def set_game(self, game, priority=0):
+        """
+        Reaponta o card para um registro (o mesmo editado ou outro jogo).
+        A arte só é recarregada se os caminhos de ícone/banner mudaram.
+        """
+        artwork_loader.set_priority(self, priority)
+        if game.id != self.game.id:        # card reciclado para outro jogo
+            frame_clock.clock().remove(self)
+            self._hover_fade     = None
+            self._hover_progress = 0.0
+            self._hovered        = False
+            self._dragging       = False
+            self._drag_origin    = None
+            self._sync_movies()            # banner do hover anterior para de tocar
+        self.game = game
+        if (game.icon_path, game.banner_path) != self._asset_paths:
+            self._load_assets()
+        self.update()
+
+    def _load_assets(self):
+        for role, gif in (("icon", self._icon_gif), ("banner", self._banner_gif)):
+            if gif:
+                gif.set_playing((self, role), False)
+                gif.frame_changed.disconnect(self._mark_dirty)
+                animation_service.service().release(gif)
+        self._icon_pix = self._icon_gif = None
+        self._banner_pix = self._banner_gif = None
+        self._asset_paths = (self.game.icon_path, self.game.banner_path)
+        self._load_asset(self.game.icon_path,   is_banner=False)
+        self._load_asset(self.game.banner_path, is_banner=True)
+        self._sync_movies()
+
     def _load_asset(self, path, is_banner):
         if not path or not os.path.exists(path):
             return
 
         if path.lower().endswith(".gif"):
-            movie = QMovie(path)
-            movie.setScaledSize(QSize(CARD_W, CARD_H))
-            movie.frameChanged.connect(self.update)   # redesenha a cada frame
-            movie.start()
+            # Animação compartilhada: o mesmo GIF no mesmo tamanho é
+            # decodificado uma vez e avança num único timer para todos os cards.
+            # O 1º frame já fica disponível; _sync_movies decide se roda.
+            gif = animation_service.service().acquire(
+                path, CARD_W, CARD_H, self.devicePixelRatioF())
+            if gif is None:
+                return
+            gif.frame_changed.connect(self._mark_dirty)   # repaint no próximo quadro
             if is_banner:
-                self._banner_movie = movie
+                self._banner_gif = gif
             else:
-                self._icon_movie = movie
+                self._icon_gif = gif
         else:
-            pix = QPixmap(path).scaled(
-                CARD_W, CARD_H,
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            if is_banner:
-                self._banner_pix = pix
-            else:
-                self._icon_pix = pix
+            # Decodificada fora da thread da GUI (via cache compartilhado);
+            # até chegar, o paintEvent mostra o placeholder com a inicial.
+            # Ícone antes do banner, que só aparece no hover.
+            artwork_loader.request(
+                path, CARD_W, CARD_H, self.devicePixelRatioF(),
+                lambda pix, p=path, b=is_banner: self._on_art_loaded(p, b, pix),
+                0 if is_banner else 1, owner=self)
+
+    def _on_art_loaded(self, path, is_banner, pix):
+        current = self.game.banner_path if is_banner else self.game.icon_path
+        if path != current or pix is None:    # card já foi reaproveitado
+            return
+        if is_banner:
+            self._banner_pix = pix
+        else:
+            self._icon_pix = pix
+        self.update()
+
+    # ── Reprodução de GIFs ─────────────────────────────────────────────────
 
-    def _current_frame(self, movie, pix):
-        """Retorna o frame atual do QMovie (GIF) ou o QPixmap estático."""
-        if movie:
-            return movie.currentPixmap()
-        return pix
+    def set_animation_allowed(self, allowed):
+        """
+        Chamado pelo PlaybackGovernor: False quando o card está fora da
+        área visível ou a janela está minimizada/sem foco.
+        """
+        if allowed != self._anim_allowed:
+            self._anim_allowed = allowed
+            self._sync_movies()
+
+    def _sync_movies(self):
+        """
+        Ícone anima se permitido; banner só enquanto está aparecendo (hover).
+        No perfil de baixo consumo os GIFs ficam parados no 1º frame.
+        """
+        allowed = self._anim_allowed and performance.animate()
+        banner_visible = self._hovered or self._hover_progress > 0
+        if self._icon_gif:
+            self._icon_gif.set_playing((self, "icon"), allowed)
+        if self._banner_gif:
+            self._banner_gif.set_playing(
+                (self, "banner"), allowed and banner_visible)
+
+    def set_art_priority(self, priority):
+        """Sobe/rebaixa os pedidos de arte ainda na fila (card entrou/saiu da tela)."""
+        artwork_loader.set_priority(self, priority)
+
+    def set_running(self, running):
+        """Mostra/esconde o selo de "em execução" (chamado pela LibraryView)."""
+        if running != self._running:
+            self._running = running
+            self.update()
 
     def _draw_centered(self, painter, pixmap):
         """
@@ -77,33 +158,63 @@ class GameCard(QWidget):
         """
         if not pixmap or pixmap.isNull():
             return
-        x = (CARD_W - pixmap.width())  // 2
-        y = (CARD_H - pixmap.height()) // 2
+        size = pixmap.deviceIndependentSize()   # tamanho lógico (HiDPI)
+        x = int(CARD_W - size.width())  // 2
+        y = int(CARD_H - size.height()) // 2
         painter.drawPixmap(x, y, pixmap)
 
-    # ── Propriedade animada ────────────────────────────────────────────────
-
-    @pyqtProperty(float)
-    def hover_progress(self): return self._hover_progress
-
-    @hover_progress.setter
-    def hover_progress(self, val):
-        self._hover_progress = val
-        self.update()
+    def _on_settings_changed(self, keys):
+        if "card_border" in keys:
+            self._border_color = QColor(settings_manager.get("card_border", "#6060cc"))
+            self.update()
+        if "performance_profile" in keys:
+            self._layers.clear()          # render hints dependem do perfil
+            GameCard._shared_layers.clear()
+            self._sync_movies()
+            self.update()
+
+    # ── Fade do hover (frame_clock) ────────────────────────────────────────
+
+    def _mark_dirty(self):
+        """Repaint agrupado com os demais cards no próximo quadro do relógio."""
+        frame_clock.clock().mark_dirty(self)
+
+    def _fade_to(self, target):
+        clock = frame_clock.clock()
+        if not performance.hover_fade():  # baixo consumo: troca instantânea
+            clock.remove(self)
+            self._hover_fade     = None
+            self._hover_progress = target
+            self._sync_movies()
+            self.update()
+            return
+        self._hover_fade = (self._hover_progress, target, clock.now())
+        clock.add(self)
+
+    def tick(self, now):
+        """Avança o fade do hover; chamado pelo frame_clock a cada quadro."""
+        if self._hover_fade is None:
+            return False
+        start, end, t0 = self._hover_fade
+        t = min(1.0, (now - t0) / HOVER_MS)
+        self._hover_progress = start + (end - start) * _HOVER_EASING.valueForProgress(t)
+        self._mark_dirty()
+        if t < 1.0:
+            return True
+        self._hover_fade = None
+        self._sync_movies()               # fim do fade-out pausa o banner
+        return False
 
     # ── Eventos de mouse ──────────────────────────────────────────────────
 
     def enterEvent(self, e):
-        self._anim.stop()
-        self._anim.setStartValue(self._hover_progress)
-        self._anim.setEndValue(1.0)
-        self._anim.start()
+        self._hovered = True
+        self._sync_movies()
+        self._fade_to(1.0)
 
     def leaveEvent(self, e):
-        self._anim.stop()
-        self._anim.setStartValue(self._hover_progress)
-        self._anim.setEndValue(0.0)
-        self._anim.start()
+        self._hovered = False
+        self._fade_to(0.0)
 
     def mousePressEvent(self, e):
         if e.button() == Qt.MouseButton.LeftButton:
@@ -115,20 +226,19 @@ class GameCard(QWidget):
             return
         if self._drag_origin is None:
             return
-        if (e.pos() - self._drag_origin).manhattanLength() > 10:
+        # O limite só decide o início; depois o card segue o mouse (e a
+        # posição local fica perto da origem, já que ele se move junto)
+        if self._dragging or (e.pos() - self._drag_origin).manhattanLength() > 10:
             self._dragging = True
-            self.drag_moved.emit(self.game["id"], self.mapToGlobal(e.pos()))
+            self.drag_moved.emit(self.game.id, self.mapToGlobal(e.pos()))
 
     def mouseReleaseEvent(self, e):
         if e.button() == Qt.MouseButton.LeftButton:
             if not self._dragging:
-                exe = self.game.get("exe_path", "")
-                if exe:
-                    if exe.startswith("steam://"):
-                        # Jogos importados via varredura Steam
-                        subprocess.Popen(["start", "", exe], shell=True)
-                    elif os.path.exists(exe):
-                        subprocess.Popen([exe], cwd=os.path.dirname(exe))
+                # Spawn numa thread do launcher; cliques duplos são ignorados
+                launcher.service().launch(self.game)
+            else:
+                self.drag_finished.emit(self.game.id)
             self._dragging    = False
             self._drag_origin = None
 
@@ -147,77 +257,168 @@ class GameCard(QWidget):
         remove_action = menu.addAction("🗑  Remover Jogo")
         action = menu.exec(self.mapToGlobal(pos))
         if action == edit_action:
-            self.edit_requested.emit(self.game["id"])
+            self.edit_requested.emit(self.game.id)
         elif action == remove_action:
-            self.removed.emit(self.game["id"])
-
-    # ── Renderização ──────────────────────────────────────────────────────
-
-    def paintEvent(self, e):
-        p = QPainter(self)
-        p.setRenderHints(
-            QPainter.RenderHint.Antialiasing |
-            QPainter.RenderHint.SmoothPixmapTransform,
-        )
-
-        # Clip arredondado — impede vazamento de qualquer camada
+            self.removed.emit(self.game.id)
+
+    # ── Camadas pré-compostas ─────────────────────────────────────────────
+    #
+    # Cada camada estática (ícone, banner, overlay do nome, bordas) é
+    # desenhada uma vez num QPixmap do tamanho do card, já com o clip
+    # arredondado, e guardada com uma chave. Enquanto a chave (imagem, nome,
+    # cor, DPR) não mudar, um frame do fade do hover é só blit com opacidade.
+    # Frames de GIF mudam a cada tick e são desenhados direto (_draw_frame).
+    # As bordas só dependem da cor e do DPR: uma cópia para todos os cards.
+
+    _shared_layers = {}    # (nome, dpr) → ((chave, dpr), QPixmap)
+
+    def _layer(self, name, key, build, shared=False):
+        dpr   = self.devicePixelRatioF()
+        cache = GameCard._shared_layers if shared else self._layers
+        slot  = (name, dpr) if shared else name
+        entry = cache.get(slot)
+        if entry is None or entry[0] != (key, dpr):
+            pix = QPixmap(round(CARD_W * dpr), round(CARD_H * dpr))
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(Qt.GlobalColor.transparent)
+            p = QPainter(pix)
+            p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform,
+                            performance.profile()["smooth"])
+            build(p)
+            p.end()
+            cache[slot] = entry = ((key, dpr), pix)
+        return entry[1]
+
+    def release(self):
+        """Card voltando para o pool: libera as camadas e os pedidos de arte."""
+        self._layers.clear()
+        artwork_loader.cancel(self)
+        waiting = ((self.game.icon_path,   self._icon_gif,   self._icon_pix),
+                   (self.game.banner_path, self._banner_gif, self._banner_pix))
+        if any(path and not gif and pix is None for path, gif, pix in waiting):
+            self._asset_paths = None      # pedido cancelado: set_game recarrega
+
+    @staticmethod
+    def _clip_rounded(p):
+        """Clip arredondado — impede vazamento de qualquer camada."""
         clip = QPainterPath()
         clip.addRoundedRect(QRectF(0, 0, CARD_W, CARD_H), 12, 12)
         p.setClipPath(clip)
 
-        # Camada 1 — ícone (estado padrão)
-        icon_frame = self._current_frame(self._icon_movie, self._icon_pix)
-        if icon_frame:
-            p.setOpacity(1.0)
-            self._draw_centered(p, icon_frame)
-        else:
+    def _draw_frame(self, p, frame):
+        """Frame de GIF: clip + desenho direto, sem passar por uma camada."""
+        p.save()
+        self._clip_rounded(p)
+        self._draw_centered(p, frame)
+        p.restore()
+
+    def _icon_layer(self):
+        pix = self._icon_pix
+        if pix and not pix.isNull():
+            def build(p):
+                self._clip_rounded(p)
+                self._draw_centered(p, pix)
+            return self._layer("icon", pix.cacheKey(), build)
+
+        letter = self.game.name[:1].upper()
+        def build(p):
+            self._clip_rounded(p)
             p.fillRect(0, 0, CARD_W, CARD_H, QColor(28, 28, 55))
             p.setPen(QColor(140, 140, 200))
             p.setFont(QFont("Segoe UI Emoji", 52, QFont.Weight.Bold))
-            p.drawText(
-                QRect(0, 0, CARD_W, CARD_H - 40),
-                Qt.AlignmentFlag.AlignCenter,
-                self.game["name"][0].upper(),
-            )
-
-        # Camada 2 — banner com fade no hover (suporta GIF)
-        if self._hover_progress > 0:
-            banner_frame = self._current_frame(self._banner_movie, self._banner_pix)
-            if banner_frame:
-                p.setOpacity(self._hover_progress)
-                self._draw_centered(p, banner_frame)
-
-        # Camada 3 — overlay com nome do jogo
-        if self._hover_progress > 0:
-            p.setOpacity(self._hover_progress * 0.88)
-            p.fillRect(0, CARD_H - 70, CARD_W, 70, QColor(0, 0, 0))
-            p.setOpacity(self._hover_progress)
+            p.drawText(QRect(0, 0, CARD_W, CARD_H - 40),
+                       Qt.AlignmentFlag.AlignCenter, letter)
+        return self._layer("icon", ("placeholder", letter), build)
+
+    def _banner_layer(self):
+        pix = self._banner_pix
+        if not pix or pix.isNull():
+            return None
+        def build(p):
+            self._clip_rounded(p)
+            self._draw_centered(p, pix)
+        return self._layer("banner", pix.cacheKey(), build)
+
+    def _overlay_layer(self):
+        """Faixa preta (88%) + nome — desenhada com a opacidade do hover."""
+        name = self.game.name
+        def build(p):
+            self._clip_rounded(p)
+            p.fillRect(0, CARD_H - 70, CARD_W, 70, QColor(0, 0, 0, round(255 * 0.88)))
             p.setPen(QColor(255, 255, 255))
             p.setFont(QFont("Segoe UI Emoji", 11, QFont.Weight.Bold))
-            p.drawText(
-                QRect(10, CARD_H - 65, CARD_W - 20, 60),
-                Qt.AlignmentFlag.AlignVCenter,
-                self.game["name"],
-            )
+            p.drawText(QRect(10, CARD_H - 65, CARD_W - 20, 60),
+                       Qt.AlignmentFlag.AlignVCenter, name)
+        return self._layer("overlay", name, build)
+
+    def _border_layer(self, hover):
+        """Borda normal (2px) ou a do hover completo (3px, 60% mais clara)."""
+        base = self._border_color
+        if hover:
+            color = QColor(min(255, int(base.red()   * 1.6)),
+                           min(255, int(base.green() * 1.6)),
+                           min(255, int(base.blue()  * 1.6)))
+            width = 3
+        else:
+            color, width = base, 2
+        def build(p):
+            p.setPen(QPen(color, width))
+            p.drawRoundedRect(QRectF(1, 1, CARD_W - 2, CARD_H - 2), 12, 12)
+        return self._layer("border_hover" if hover else "border", color.rgba(), build,
+                           shared=True)
+
+    def _badge_layer(self, text):
+        """Selo de estado ("em execução", "desinstalado") no canto superior esquerdo."""
+        accent = self._border_color
+        def build(p):
+            rect = QRectF(8, 8, 104, 24)
+            p.setPen(Qt.PenStyle.NoPen)
+            p.setBrush(QColor(0, 0, 0, 190))
+            p.drawRoundedRect(rect, 12, 12)
+            p.setPen(QColor(min(255, accent.red() + 120), min(255, accent.green() + 120),
+                            min(255, accent.blue() + 120)))
+            p.setFont(QFont("Segoe UI Emoji", 9, QFont.Weight.Bold))
+            p.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        return self._layer("badge", (text, accent.rgba()), build)
 
-        # Borda colorida (desabilita clip para não cortar a borda)
-        p.setOpacity(1.0)
-        p.setClipping(False)
-
-        import settings_manager
-        s = settings_manager.load_settings()
-        base_color = QColor(s.get("card_border", "#6060cc"))
-
-        if self._hover_progress > 0:
-            r = min(255, int(base_color.red()   * (1 + self._hover_progress * 0.6)))
-            g = min(255, int(base_color.green() * (1 + self._hover_progress * 0.6)))
-            b = min(255, int(base_color.blue()  * (1 + self._hover_progress * 0.6)))
-            border_color = QColor(r, g, b)
-            pen_width    = 3
+    # ── Renderização ──────────────────────────────────────────────────────
+
+    def paintEvent(self, e):
+        p = QPainter(self)
+        hover = self._hover_progress
+
+        # Camada 1 — ícone (estado padrão) ou placeholder com a inicial
+        frame = self._icon_gif.current_pixmap() if self._icon_gif else None
+        if frame and not frame.isNull():
+            self._draw_frame(p, frame)
         else:
-            border_color = base_color
-            pen_width    = 2
+            p.drawPixmap(0, 0, self._icon_layer())
+
+        if hover > 0:
+            p.setOpacity(hover)
+            # Camada 2 — banner com fade no hover (suporta GIF)
+            frame = self._banner_gif.current_pixmap() if self._banner_gif else None
+            if frame and not frame.isNull():
+                self._draw_frame(p, frame)
+            else:
+                banner = self._banner_layer()
+                if banner:
+                    p.drawPixmap(0, 0, banner)
+            # Camada 3 — overlay com nome do jogo
+            p.drawPixmap(0, 0, self._overlay_layer())
+
+        # Borda — a do hover entra por cima da normal, com a mesma opacidade
+        p.setOpacity(1.0)
+        p.drawPixmap(0, 0, self._border_layer(hover=False))
+        if hover > 0:
+            p.setOpacity(hover)
+            p.drawPixmap(0, 0, self._border_layer(hover=True))
 
-        p.setPen(QPen(border_color, pen_width))
-        p.drawRoundedRect(1, 1, CARD_W - 2, CARD_H - 2, 12, 12)
+        if self._running:
+            p.setOpacity(1.0)
+            p.drawPixmap(0, 0, self._badge_layer("▶ Em execução"))
+        elif self.game.extra.get("steam_uninstalled"):
+            p.setOpacity(1.0)
+            p.drawPixmap(0, 0, self._badge_layer("⚠ Desinstalado"))
         p.end()
@@ -1,43 +1,494 @@
-import json, os, uuid
+import bisect, json, os, sqlite3, threading, uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from persistence import DebouncedWriter
+import settings_manager
 
-DATA_FILE = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")),
-                         "GameHub", "games.json")
+DATA_DIR  = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "GameHub")
+DATA_FILE = os.path.join(DATA_DIR, "games.json")
+DB_FILE   = os.path.join(DATA_DIR, "games.db")
+
+_FIELDS = ("id", "name", "exe_path", "icon_path", "banner_path", "order")
+
+ORDER_STEP = 1024.0     # distância entre chaves de ordenação novas
+
+
+@dataclass(slots=True)
+class Game:
+    """Registro compacto de um jogo (uma entrada do games.json)."""
+    id:          str
+    name:        str
+    exe_path:    str = ""
+    icon_path:   str = ""    # ✅ caminho original, sem copiar
+    banner_path: str = ""    # ✅ caminho original, sem copiar
+    order:       float = 0.0 # chave de ordenação fracionária (ordem de exibição)
+    extra:       dict = field(default_factory=dict)  # chaves desconhecidas, preservadas
+
+    @classmethod
+    def from_dict(cls, d):
+        extra = {k: v for k, v in d.items() if k not in _FIELDS}
+        return cls(d["id"], d.get("name", ""), d.get("exe_path", ""),
+                   d.get("icon_path", ""), d.get("banner_path", ""),
+                   float(d.get("order", 0.0)), extra)
+
+    def to_dict(self):
+        return {
+            "id":          self.id,
+            "name":        self.name,
+            "exe_path":    self.exe_path,
+            "icon_path":   self.icon_path,
+            "banner_path": self.banner_path,
+            "order":       self.order,
+            **self.extra,
+        }
+
+
+# ── Backends de armazenamento ─────────────────────────────────────────────────
+#
+# Um backend sabe carregar a biblioteca (já ordenada pela chave `order` de
+# cada jogo) e receber as alterações do GameStore via
+# commit(games, changed, removed):
+#   games   → lista completa, na ordem de exibição
+#   changed → dict id → Game novo/alterado (inclui mudanças de ordem)
+#   removed → ids apagados
+# Ambos gravam em segundo plano.
+
+class JsonBackend:
+    """games.json com a chave de ordenação dentro de cada registro."""
+    name = "json"
+
+    def __init__(self, path=DATA_FILE):
+        self.path    = path
+        self._writer = DebouncedWriter(path)
+
+    def load(self):
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        games = [Game.from_dict(d) for d in records]
+        missing = [g for g, d in zip(games, records) if "order" not in d]
+        if missing:
+            self._migrate_order(games, missing)
+        games.sort(key=lambda g: g.order)
+        return games
+
+    def _migrate_order(self, games, missing):
+        """
+        Registros sem chave de ordenação (formato antigo, com a lista
+        game_order no settings.json, ou editados à mão) recebem chaves
+        depois das existentes, seguindo o game_order. Regrava uma vez.
+        """
+        legacy = settings_manager.get("game_order", [])
+        rank   = {gid: i for i, gid in enumerate(legacy)}
+        missing.sort(key=lambda g: rank.get(g.id, len(rank)))
+        moved  = {g.id for g in missing}
+        top    = max((g.order for g in games if g.id not in moved), default=0.0)
+        for i, g in enumerate(missing, 1):
+            g.order = top + i * ORDER_STEP
+        records = [g.to_dict() for g in games]
+        self._writer.schedule(lambda: records)
+        if legacy:
+            settings_manager.update(game_order=[])
+
+    def commit(self, games, changed, removed):
+        # O arquivo é sempre reescrito inteiro. Os registros viram dicts
+        # aqui, na thread de quem alterou: a GUI continua mexendo nos Game
+        # enquanto o writer grava, e um snapshot tirado lá poderia sair com
+        # edições pela metade. json.dump e fsync seguem na thread do writer.
+        records = [g.to_dict() for g in games]
+        self._writer.schedule(lambda: records)
+
+    def flush(self):
+        self._writer.flush()
+
+
+class SqliteBackend:
+    """
+    Banco SQLite local (games.db) indexado por id, nome e posição.
+    Grava só as linhas alteradas — mover um jogo muda a posição (chave de
+    ordenação fracionária) de uma linha só. Na primeira abertura migra
+    automaticamente o games.json existente.
+    """
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id          TEXT PRIMARY KEY,
+            name        TEXT NOT NULL,
+            exe_path    TEXT NOT NULL DEFAULT '',
+            icon_path   TEXT NOT NULL DEFAULT '',
+            banner_path TEXT NOT NULL DEFAULT '',
+            position    REAL NOT NULL,
+            extra       TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS idx_games_name     ON games(name COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_games_position ON games(position);
+    """
+
+    def __init__(self, path=DB_FILE, json_path=DATA_FILE):
+        self.path      = path
+        self.json_path = json_path
+        self._conn     = None
+        self._lock     = threading.Lock()
+        self._rows     = {}      # id → linha alterada (tupla), pendente
+        self._deleted  = set()
+        self._writer   = DebouncedWriter(path, write=self._apply)
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def load(self):
+        migrate = not os.path.exists(self.path)
+        conn = self._connect()
+        if migrate:
+            games = JsonBackend(self.json_path).load()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(g) for g in games])
+        rows = conn.execute(
+            "SELECT id, name, exe_path, icon_path, banner_path, position, extra "
+            "FROM games ORDER BY position").fetchall()
+        # Bancos antigos têm posições inteiras 0..n-1 — já servem de chave
+        return [Game(r[0], r[1], r[2], r[3], r[4], float(r[5]), json.loads(r[6] or "{}"))
+                for r in rows]
+
+    @staticmethod
+    def _row(g):
+        return (g.id, g.name, g.exe_path, g.icon_path, g.banner_path,
+                g.order, json.dumps(g.extra, ensure_ascii=False))
+
+    def commit(self, games, changed, removed):
+        with self._lock:
+            for gid in removed:
+                self._deleted.add(gid)
+                self._rows.pop(gid, None)
+            for gid, g in changed.items():       # copiado já, como no JSON
+                self._deleted.discard(gid)
+                self._rows[gid] = self._row(g)
+        self._writer.schedule(self._drain)
+
+    def _drain(self):
+        with self._lock:
+            rows,    self._rows    = self._rows,    {}
+            deleted, self._deleted = self._deleted, set()
+        return list(rows.values()), [(gid,) for gid in deleted]
+
+    def _apply(self, path, data):
+        upserts, deletes = data
+        conn = self._connect()
+        with conn:
+            conn.executemany("DELETE FROM games WHERE id = ?", deletes)
+            conn.executemany(
+                "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+
+    def flush(self):
+        self._writer.flush()
+
+
+BACKENDS = {"json": JsonBackend, "sqlite": SqliteBackend}
+
+def make_backend(name):
+    return BACKENDS.get(name, JsonBackend)()
+
+
+class GameStore:
+    """
+    Biblioteca de jogos em memória.
+    Carrega o backend uma única vez e mantém um índice id → Game. O dict
+    preserva a ordem de inserção, então também serve como a lista ordenada
+    de ids (ordem de exibição) — get/update/delete são O(1).
+    A ordem vem da chave fracionária `order` de cada jogo: jogos novos
+    entram depois do último e mover um jogo só troca a chave dele (um
+    valor entre as chaves dos novos vizinhos).
+    """
+    def __init__(self, backend=None):
+        self.backend  = backend
+        self._games   = {}
+        self._loaded  = False
+        self._depth   = 0       # profundidade de transaction() aninhadas
+        self._backup  = None
+        self._reset_changes()
+
+    def _reset_changes(self):
+        self._changed = set()
+        self._removed = set()
+
+    # ── Carregamento / gravação ────────────────────────────────────────────
+
+    def load(self):
+        if self.backend is None:
+            self.backend = make_backend(settings_manager.get("storage_backend", "json"))
+        self._games  = {g.id: g for g in self.backend.load()}
+        self._loaded = True
+        self._reset_changes()
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def _commit(self):
+        """Grava agora, ou adia até o fim da transação corrente."""
+        if not self._depth:
+            self.save()
+
+    def save(self):
+        """Entrega as alterações ao backend, que grava em segundo plano."""
+        if not (self._changed or self._removed):
+            return
+        changed = {gid: self._games[gid] for gid in self._changed}
+        self.backend.commit(list(self._games.values()), changed, self._removed)
+        self._reset_changes()
+
+    def flush(self):
+        """Grava agora qualquer alteração pendente (bloqueante)."""
+        self.save()
+        if self.backend is not None:
+            self.backend.flush()
+
+    def use_backend(self, backend):
+        """
+        Troca o backend em tempo de execução. O novo backend é carregado
+        (migrando do JSON, se for o caso) e recebe o estado atual completo,
+        então os dois armazenamentos terminam com o mesmo conteúdo.
+        """
+        self._ensure_loaded()
+        self.flush()
+        stale = {g.id for g in backend.load()}
+        self.backend  = backend
+        self._changed = set(self._games)
+        self._removed = stale - self._changed
+        self.save()
+
+    # ── Consultas ──────────────────────────────────────────────────────────
+
+    def all(self):
+        self._ensure_loaded()
+        return list(self._games.values())
+
+    def ids(self):
+        self._ensure_loaded()
+        return list(self._games)
+
+    def get(self, game_id):
+        self._ensure_loaded()
+        return self._games.get(game_id)
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        self._ensure_loaded()
+        return game_id in self._games
+
+    # ── Chaves de ordenação ────────────────────────────────────────────────
+
+    def _next_order(self):
+        last = next(reversed(self._games.values()), None)
+        return (last.order if last else 0.0) + ORDER_STEP
+
+    def _sort(self):
+        self._games = dict(sorted(self._games.items(), key=lambda kv: kv[1].order))
+
+    def _renumber(self, ids):
+        """Reescreve todas as chaves (só quando a precisão do float se esgota)."""
+        for i, gid in enumerate(ids, 1):
+            self._games[gid].order = i * ORDER_STEP
+            self._changed.add(gid)
+
+    @staticmethod
+    def _kept(keys):
+        """
+        Índices da maior subsequência crescente de `keys` — esses jogos
+        mantêm a chave; só os demais precisam de uma nova.
+        """
+        tails, tail_idx, prev = [], [], [None] * len(keys)
+        for i, k in enumerate(keys):
+            j = bisect.bisect_left(tails, k)
+            if j == len(tails):
+                tails.append(k); tail_idx.append(i)
+            else:
+                tails[j] = k;    tail_idx[j] = i
+            prev[i] = tail_idx[j - 1] if j else None
+        kept, i = set(), tail_idx[-1] if tail_idx else None
+        while i is not None:
+            kept.add(i)
+            i = prev[i]
+        return kept
+
+    # ── Mutações ───────────────────────────────────────────────────────────
+
+    def add(self, name, exe_path, icon_path="", banner_path=""):
+        self._ensure_loaded()
+        game = Game(str(uuid.uuid4()), name, exe_path, icon_path, banner_path,
+                    self._next_order())
+        self._games[game.id] = game
+        self._changed.add(game.id)
+        self._commit()
+        return game
+
+    def add_many(self, items):
+        """Adiciona vários jogos (dicts com os argumentos de add) numa só gravação."""
+        with self.transaction():
+            return [self.add(**item) for item in items]
+
+    def update(self, game_id, **changes):
+        self._ensure_loaded()
+        game = self._games.get(game_id)
+        if game is None:
+            return None
+        for key, val in changes.items():
+            setattr(game, key, val)
+        if "order" in changes:
+            self._sort()
+        self._changed.add(game_id)
+        self._commit()
+        return game
+
+    def replace(self, games):
+        """Substitui a biblioteca inteira; a ordem da lista vira a de exibição."""
+        self._ensure_loaded()
+        old = set(self._games)
+        self._games = {g.id: g for g in games}
+        self._renumber(list(self._games))
+        self._removed |= old - set(self._games)
+        self._commit()
+
+    def delete(self, game_id):
+        self._ensure_loaded()
+        if self._games.pop(game_id, None) is not None:
+            self._changed.discard(game_id)
+            self._removed.add(game_id)
+            self._commit()
+
+    def set_order(self, ids):
+        """
+        Define a ordem de exibição; ids desconhecidos são ignorados e os
+        omitidos vão para o fim. Só ganham chave nova os jogos fora da maior
+        subsequência já ordenada — mover um jogo grava um registro só.
+        """
+        self._ensure_loaded()
+        ordered = {gid: self._games[gid] for gid in ids if gid in self._games}
+        for gid, g in self._games.items():
+            ordered.setdefault(gid, g)
+        ids = list(ordered)
+        if ids == list(self._games):
+            return
+        keys = [g.order for g in ordered.values()]
+        kept = self._kept(keys)
+        i = 0
+        while i < len(ids):
+            if i in kept:
+                i += 1
+                continue
+            j = i                              # [i, j) → trecho a rechavear
+            while j < len(ids) and j not in kept:
+                j += 1
+            lo = keys[i - 1] if i else None
+            hi = keys[j] if j < len(ids) else None
+            n  = j - i
+            for k in range(1, n + 1):
+                if lo is None and hi is None:
+                    key = k * ORDER_STEP
+                elif lo is None:
+                    key = hi - (n + 1 - k) * ORDER_STEP
+                elif hi is None:
+                    key = lo + k * ORDER_STEP
+                else:
+                    key = lo + (hi - lo) * k / (n + 1)
+                keys[i + k - 1] = key
+            i = j
+        if any(a >= b for a, b in zip(keys, keys[1:])):
+            self._renumber(ids)                # sem precisão entre vizinhos
+        else:
+            for gid, key in zip(ids, keys):
+                if ordered[gid].order != key:
+                    ordered[gid].order = key
+                    self._changed.add(gid)
+        self._games = ordered
+        self._commit()
+
+    # ── Transações ─────────────────────────────────────────────────────────
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa mutações em memória e grava uma única vez ao sair.
+        Se o bloco levantar exceção, o estado anterior é restaurado e nada
+        é gravado. Transações aninhadas se juntam à mais externa.
+        """
+        self._ensure_loaded()
+        if self._depth == 0:
+            self._backup = {gid: replace(g) for gid, g in self._games.items()}
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self._depth == 1:
+                self._games = self._backup
+                self._reset_changes()
+            raise
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._backup = None
+                self.save()
+
+
+_store = None
+
+def get_store():
+    """Retorna o GameStore do processo (carregado sob demanda)."""
+    global _store
+    if _store is None:
+        _store = GameStore()
+    return _store
+
+
+# ── API de módulo (atalhos para o store global) ───────────────────────────────
 
 def load_games():
-    if not os.path.exists(DATA_FILE):
-        return []
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return get_store().all()
+
+def get_game(game_id):
+    return get_store().get(game_id)
 
 def save_games(games):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(games, f, indent=2, ensure_ascii=False)
+    get_store().replace(games)
+
+def set_order(ids):
+    get_store().set_order(ids)
+
+def use_backend(name):
+    """Troca o backend do store global se `name` for diferente do atual."""
+    store = get_store()
+    store._ensure_loaded()
+    if store.backend.name != name and name in BACKENDS:
+        store.use_backend(make_backend(name))
 
 def add_game(name, exe_path, icon_path="", banner_path=""):
-    games = load_games()
-    game  = {
-        "id":          str(uuid.uuid4()),
-        "name":        name,
-        "exe_path":    exe_path,
-        "icon_path":   icon_path,    # ✅ caminho original, sem copiar
-        "banner_path": banner_path,  # ✅ caminho original, sem copiar
-    }
-    games.append(game)
-    save_games(games)
-    return game
+    return get_store().add(name, exe_path, icon_path, banner_path)
+
+def add_games(items):
+    """
+    Importação em lote: cada item é um dict com name, exe_path e,
+    opcionalmente, icon_path/banner_path. Uma única gravação no final.
+    """
+    return get_store().add_many(items)
+
+def transaction():
+    """Uso: ``with game_manager.transaction(): ...`` — uma gravação ao sair."""
+    return get_store().transaction()
 
 def remove_game(game_id):
-    games = [g for g in load_games() if g["id"] != game_id]
-    save_games(games)
+    get_store().delete(game_id)
 
 def edit_game(game_id, name, exe_path, icon_path="", banner_path=""):
-    games = load_games()
-    for g in games:
-        if g["id"] == game_id:
-            g["name"]        = name
-            g["exe_path"]    = exe_path
-            g["icon_path"]   = icon_path    # ✅ caminho original
-            g["banner_path"] = banner_path  # ✅ caminho original
-            break
-    save_games(games)
+    return get_store().update(game_id, name=name, exe_path=exe_path,
+                              icon_path=icon_path, banner_path=banner_path)
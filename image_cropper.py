@@ -1,9 +1,9 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
                               QPushButton, QLabel, QSizePolicy)
 from PyQt6.QtCore import Qt, QRect, QPoint
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QPen, QCursor
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QPen, QCursor, QImageReader
 from PIL import Image
-import os, tempfile
+import artwork_cache, os, tempfile
 
 STYLE = """
 QDialog { background:#12122a; color:#fff; }
@@ -20,21 +20,24 @@ QLabel#hint { color:#6666aa; font-size:12px; }
 """
 
 class CropCanvas(QLabel):
-    def __init__(self, pixmap, target_w, target_h, parent=None):
+    def __init__(self, image_path, target_w, target_h, parent=None):
         super().__init__(parent)
         self.target_w = target_w
         self.target_h = target_h
-        self._orig_pixmap = pixmap
+
+        # Só o cabeçalho é lido para saber o tamanho original; a versão de
+        # exibição vem do cache de arte compartilhado.
+        orig = QImageReader(image_path).size()
+        orig_w, orig_h = max(1, orig.width()), max(1, orig.height())
 
         max_display = 600
-        scale = min(max_display / pixmap.width(), max_display / pixmap.height(), 1.0)
-        self._disp_w = int(pixmap.width() * scale)
-        self._disp_h = int(pixmap.height() * scale)
+        scale = min(max_display / orig_w, max_display / orig_h, 1.0)
+        self._disp_w = max(1, int(orig_w * scale))
+        self._disp_h = max(1, int(orig_h * scale))
         self._scale = scale
-        self._display_pixmap = pixmap.scaled(
-            self._disp_w, self._disp_h,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation)
+        self._display_pixmap = artwork_cache.get_pixmap(
+            image_path, self._disp_w, self._disp_h,
+            self.devicePixelRatioF(), artwork_cache.FIT) or QPixmap()
 
         self.setFixedSize(self._disp_w, self._disp_h)
         self.setCursor(QCursor(Qt.CursorShape.OpenHandCursor))
@@ -183,8 +186,7 @@ class ImageCropper(QDialog):
         hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(hint)
 
-        pixmap = QPixmap(self.image_path)
-        self.canvas = CropCanvas(pixmap, tw, th, self)
+        self.canvas = CropCanvas(self.image_path, tw, th, self)
         self.canvas.setSizePolicy(
             QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
 
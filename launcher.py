@@ -0,0 +1,128 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+import game_manager, subprocess, threading, time, os
+
+
+DEBOUNCE_S = 2.0     # cliques repetidos no mesmo jogo dentro da janela são ignorados
+
+
+class _LaunchSignals(QObject):
+    spawned = pyqtSignal(str, float, bool)   # id, ms até o spawn, processo rastreado
+    exited  = pyqtSignal(str, float, int)    # id, duração da sessão (s), código de saída
+    failed  = pyqtSignal(str, str)           # id, mensagem
+
+
+def _run(game_id, exe, signals):
+    """
+    Thread do lançamento: cria o processo (fora da thread da GUI) e, se ele
+    puder ser rastreado, espera terminar para medir a sessão.
+    URLs steam:// são entregues ao cliente Steam (os.startfile, sem shell)
+    e não têm processo próprio.
+    """
+    t0 = time.perf_counter()
+    try:
+        if exe.startswith("steam://"):
+            # Jogos importados via varredura Steam
+            os.startfile(exe)
+            proc = None
+        elif os.path.exists(exe):
+            proc = subprocess.Popen([exe], cwd=os.path.dirname(exe))
+        else:
+            signals.failed.emit(game_id, f"Executável não encontrado: {exe}")
+            return
+    except OSError as e:
+        signals.failed.emit(game_id, str(e))
+        return
+    signals.spawned.emit(game_id, (time.perf_counter() - t0) * 1000, proc is not None)
+    if proc is None:
+        return
+    start = time.monotonic()
+    code  = proc.wait()
+    signals.exited.emit(game_id, time.monotonic() - start, code)
+
+
+class LauncherService(QObject):
+    """
+    Abre os jogos sem bloquear a interface.
+    O Popen roda numa thread própria (que depois espera o processo), então
+    o clique retorna na hora. Cliques duplos no mesmo jogo são ignorados
+    enquanto ele está abrindo/rodando ou dentro de DEBOUNCE_S.
+    Guarda no registro do jogo o tempo até o spawn (extra: launch_ms,
+    launch_ms_avg, launches) e, ao fim de cada sessão rastreada, soma o
+    tempo de jogo (extra: playtime_s, last_played).
+    """
+    launched        = pyqtSignal(str, float)   # id, ms até o spawn
+    exited          = pyqtSignal(str, float)   # id, duração da sessão (s)
+    failed          = pyqtSignal(str, str)     # id, mensagem
+    running_changed = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._busy    = set()    # ids abrindo ou com processo rodando
+        self._running = set()    # ids com processo rastreado rodando
+        self._last    = {}       # id → instante (monotonic) do último lançamento
+        self._signals = _LaunchSignals()
+        self._signals.spawned.connect(self._on_spawned)
+        self._signals.exited.connect(self._on_exited)
+        self._signals.failed.connect(self._on_failed)
+
+    # ── API ────────────────────────────────────────────────────────────────
+
+    def launch(self, game):
+        """Abre o jogo; False se não tem executável ou foi ignorado (debounce)."""
+        exe = game.exe_path
+        now = time.monotonic()
+        if not exe or game.id in self._busy or now - self._last.get(game.id, -DEBOUNCE_S) < DEBOUNCE_S:
+            return False
+        self._last[game.id] = now
+        self._busy.add(game.id)
+        threading.Thread(target=_run, args=(game.id, exe, self._signals),
+                         daemon=True, name=f"launch-{game.id[:8]}").start()
+        return True
+
+    def is_running(self, game_id):
+        return game_id in self._running
+
+    # ── Resultados (na thread da GUI) ──────────────────────────────────────
+
+    def _on_spawned(self, game_id, spawn_ms, tracked):
+        if tracked:
+            self._running.add(game_id)
+            self.running_changed.emit(game_id, True)
+        else:
+            self._busy.discard(game_id)
+        game = game_manager.get_game(game_id)
+        if game is not None:
+            extra = dict(game.extra)
+            n     = int(extra.get("launches", 0))
+            avg   = float(extra.get("launch_ms_avg", 0.0))
+            extra["launches"]      = n + 1
+            extra["launch_ms"]     = round(spawn_ms, 1)
+            extra["launch_ms_avg"] = round((avg * n + spawn_ms) / (n + 1), 1)
+            game_manager.get_store().update(game_id, extra=extra)
+        self.launched.emit(game_id, spawn_ms)
+
+    def _on_exited(self, game_id, seconds, code):
+        self._busy.discard(game_id)
+        self._running.discard(game_id)
+        self.running_changed.emit(game_id, False)
+        game = game_manager.get_game(game_id)
+        if game is not None:
+            extra = dict(game.extra)
+            extra["playtime_s"]  = int(extra.get("playtime_s", 0)) + round(seconds)
+            extra["last_played"] = int(time.time())
+            game_manager.get_store().update(game_id, extra=extra)
+        self.exited.emit(game_id, seconds)
+
+    def _on_failed(self, game_id, message):
+        self._busy.discard(game_id)
+        self.failed.emit(game_id, message)
+
+
+_service = None
+
+def service():
+    """Instância global do lançador."""
+    global _service
+    if _service is None:
+        _service = LauncherService()
+    return _service
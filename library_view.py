@@ -0,0 +1,220 @@
+from PyQt6.QtWidgets import QScrollArea, QWidget
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QEasingCurve
+from game_card import GameCard, CARD_W, CARD_H
+from playback_governor import PlaybackGovernor
+import frame_clock, performance, launcher
+
+
+MARGIN, SPACING = 24, 16
+ROW_H    = CARD_H + SPACING
+OVERSCAN = 1        # linhas extras montadas acima/abaixo da área visível
+
+# Prioridade de decodificação da arte: cards na tela antes do overscan
+PRIO_VISIBLE, PRIO_OVERSCAN = 2, 0
+
+SLIDE_MS = 160      # cards deslizando para o novo lugar durante o arraste
+_SLIDE_EASING = QEasingCurve(QEasingCurve.Type.OutCubic)
+
+
+class LibraryView(QScrollArea):
+    """
+    Grid virtualizado da biblioteca.
+    Só existem GameCards para as linhas visíveis (+ OVERSCAN); ao rolar,
+    os cards que saem da tela voltam para um pool e são reaproveitados
+    (set_game) pelos que entram. O custo não cresce com o tamanho da
+    biblioteca — só com o tamanho da janela.
+
+    Também controla o arraste para reordenar: o slot alvo vem da
+    geometria do grid (aritmética, sem hit-test nos cards), os demais cards
+    deslizam para a posição prévia pelo frame_clock e a ordem final só é
+    emitida uma vez, em order_changed, quando o card é solto.
+    """
+    removed        = pyqtSignal(str)
+    edit_requested = pyqtSignal(str)
+    order_changed  = pyqtSignal(list)    # ids na nova ordem (emitido no drop)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWidgetResizable(False)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setStyleSheet("QScrollArea { border:none; background:transparent; }")
+
+        self.canvas = QWidget(); self.canvas.setObjectName("container")
+        self.setWidget(self.canvas)
+
+        self._games  = {}     # id → Game
+        self._order  = []     # ids na ordem de exibição
+        self._active = {}     # id → GameCard montado
+        self._pool   = []     # cards livres (ocultos) para reaproveitar
+        self._cols   = 2
+        self._cell_w = CARD_W
+        self.governor = PlaybackGovernor(self)   # pausa GIFs fora da tela
+
+        self._drag_id     = None  # card sendo arrastado
+        self._drag_offset = None  # ponto do card onde o mouse o pegou
+        self._drag_start  = None  # ordem antes do arraste
+        self._slides      = {}    # card → (origem, destino, início ms)
+
+        self.verticalScrollBar().valueChanged.connect(self._update_visible)
+        launcher.service().running_changed.connect(self._on_running_changed)
+
+    # ── API ────────────────────────────────────────────────────────────────
+
+    def set_games(self, games):
+        """Recebe a biblioteca (na ordem de exibição) e reconcilia os cards."""
+        self._games = {g.id: g for g in games}
+        self._order = [g.id for g in games]
+        for gid in [gid for gid in self._active if gid not in self._games]:
+            self._release(gid)
+        for gid, card in self._active.items():
+            card.set_game(self._games[gid])    # só recarrega arte se mudou
+        self._relayout()
+
+    def slot_at(self, global_pos):
+        """
+        Índice do slot mais próximo da posição global, calculado só pela
+        geometria do grid (limitado ao último jogo).
+        """
+        if not self._order:
+            return None
+        p   = self.canvas.mapFromGlobal(global_pos)
+        col = int((p.x() - MARGIN + SPACING / 2) // (self._cell_w + SPACING))
+        row = int((p.y() - MARGIN + SPACING / 2) // ROW_H)
+        col = min(max(col, 0), self._cols - 1)
+        row = max(row, 0)
+        return min(row * self._cols + col, len(self._order) - 1)
+
+    def _on_running_changed(self, game_id, running):
+        card = self._active.get(game_id)
+        if card is not None:
+            card.set_running(running)
+
+    # ── Arraste para reordenar ─────────────────────────────────────────────
+
+    def _on_drag_moved(self, game_id, global_pos):
+        card = self._active.get(game_id)
+        if card is None or game_id not in self._games:
+            return
+        if self._drag_id != game_id:           # início do arraste
+            self._drag_id     = game_id
+            self._drag_offset = global_pos - card.mapToGlobal(QPoint(0, 0))
+            self._drag_start  = list(self._order)
+            self._slides.pop(card, None)
+            card.raise_()
+        # O card arrastado segue o mouse; os outros abrem espaço no slot alvo
+        card.move(self.canvas.mapFromGlobal(global_pos - self._drag_offset))
+        target = self.slot_at(global_pos)
+        current = self._order.index(game_id)
+        if target is not None and target != current:
+            self._order.insert(target, self._order.pop(current))
+            self._update_visible()
+
+    def _on_drag_finished(self, game_id):
+        if self._drag_id != game_id:
+            return
+        self._drag_id = None
+        card = self._active.get(game_id)
+        if card is not None:
+            self._place(card, self._slot_pos(self._order.index(game_id)))
+        if self._order != self._drag_start:
+            self.order_changed.emit(list(self._order))   # persiste uma vez só
+        self._drag_start = None
+
+    def _place(self, card, pos, animate=True):
+        """Move o card para `pos`; deslizando se ele já estava na tela."""
+        target = QPoint(*pos)
+        if not animate or card.isHidden() or not performance.animate():
+            self._slides.pop(card, None)
+            card.move(target)
+            return
+        slide = self._slides.get(card)
+        if (slide[1] if slide else card.pos()) == target:
+            return
+        clock = frame_clock.clock()
+        self._slides[card] = (card.pos(), target, clock.now())
+        clock.add(self)
+
+    def tick(self, now):
+        """Avança os cards deslizando; chamado pelo frame_clock."""
+        for card, (start, end, t0) in list(self._slides.items()):
+            t = min(1.0, (now - t0) / SLIDE_MS)
+            k = _SLIDE_EASING.valueForProgress(t)
+            card.move(QPoint(round(start.x() + (end.x() - start.x()) * k),
+                             round(start.y() + (end.y() - start.y()) * k)))
+            if t >= 1.0:
+                del self._slides[card]
+        return bool(self._slides)
+
+    # ── Geometria ──────────────────────────────────────────────────────────
+
+    def _slot_pos(self, idx):
+        row, col = divmod(idx, self._cols)
+        return (MARGIN + int(col * (self._cell_w + SPACING)),
+                MARGIN + row * ROW_H)
+
+    def _relayout(self):
+        width = self.viewport().width()
+        avail = width - 2 * MARGIN
+        self._cols   = max(2, (avail + SPACING) // (CARD_W + SPACING))
+        self._cell_w = max(CARD_W, (avail - (self._cols - 1) * SPACING) / self._cols)
+        rows = -(-len(self._order) // self._cols)
+        self.canvas.resize(width, 2 * MARGIN + max(0, rows * ROW_H - SPACING))
+        self._update_visible()
+
+    def _update_visible(self):
+        top  = self.verticalScrollBar().value()
+        h    = self.viewport().height()
+        v0   = max(0, (top - MARGIN) // ROW_H)
+        v1   = (top + h - MARGIN) // ROW_H
+        r0, r1 = max(0, v0 - OVERSCAN), v1 + OVERSCAN
+        first, last = r0 * self._cols, min(len(self._order), (r1 + 1) * self._cols)
+        wanted = {self._order[i]: i for i in range(first, last)}
+        if self._drag_id is not None:          # o card arrastado nunca é reciclado
+            wanted.setdefault(self._drag_id, self._order.index(self._drag_id))
+
+        for gid in [gid for gid in self._active if gid not in wanted]:
+            self._release(gid)
+        on_screen = []
+        for gid, idx in wanted.items():
+            visible = v0 <= idx // self._cols <= v1
+            priority = PRIO_VISIBLE if visible else PRIO_OVERSCAN
+            card = self._active.get(gid)
+            if card is None:
+                card = self._acquire(gid, priority)
+            else:
+                card.set_art_priority(priority)   # pedidos na fila seguem a rolagem
+            if gid != self._drag_id:
+                self._place(card, self._slot_pos(idx), animate=self._drag_id is not None)
+            if card.isHidden():
+                card.show()
+            if visible:
+                on_screen.append(card)
+        self.governor.set_cards(on_screen, [*self._active.values(), *self._pool])
+
+    # ── Pool de cards ──────────────────────────────────────────────────────
+
+    def _acquire(self, gid, priority):
+        game = self._games[gid]
+        if self._pool:
+            card = self._pool.pop()
+            card.set_game(game, priority)
+        else:
+            card = GameCard(game, self.canvas, priority)
+            card.removed.connect(self.removed)
+            card.edit_requested.connect(self.edit_requested)
+            card.drag_moved.connect(self._on_drag_moved)
+            card.drag_finished.connect(self._on_drag_finished)
+        card.set_running(launcher.service().is_running(gid))
+        self._active[gid] = card
+        return card
+
+    def _release(self, gid):
+        card = self._active.pop(gid)
+        self._slides.pop(card, None)
+        card.hide()
+        card.release()
+        self._pool.append(card)
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._relayout()
@@ -1,10 +1,13 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from main_window import MainWindow
+import persistence, thumbnail_cache
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+    app.aboutToQuit.connect(persistence.flush_all)
+    thumbnail_cache.collect_garbage_async()
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -1,16 +1,20 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                              QPushButton, QScrollArea, QLabel, QGridLayout,
-                              QFrame, QDialog, QListWidget, QListWidgetItem,
-                              QMessageBox)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap, QMovie
-from game_card import GameCard
+                              QPushButton, QLabel, QFrame, QDialog, QProgressBar,
+                              QListWidget, QListWidgetItem, QMessageBox)
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap
+from library_view import LibraryView
+from wallpaper import GifWallpaper, StaticWallpaper
 from add_game_dialog import AddGameDialog
 from settings_dialog import SettingsDialog
-from steam_scanner import scan_steam_games
-import game_manager, settings_manager, os
+from steam_watcher import SteamWatcher
+import steam_scanner
+import game_manager, settings_manager, persistence, performance, launcher, os, threading
 
 
+THEME_KEYS = {"bg_image", "bg_color", "accent_color",
+              "header_color", "card_border", "text_color", "performance_profile"}
+
 def build_style(s):
     return f"""
     * {{ font-family: 'Segoe UI', sans-serif; }}
@@ -36,9 +40,19 @@ def build_style(s):
     """
 
 
+class _ScanSignals(QObject):
+    found    = pyqtSignal(dict)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)      # resultado do rescan, None se cancelado
+
+
 class SteamScanDialog(QDialog):
-    """Lista os jogos Steam encontrados para o usuário escolher quais importar."""
-    def __init__(self, games, parent=None):
+    """
+    Varre as bibliotecas Steam numa thread (steam_scanner.rescan) e lista
+    os jogos novos à medida que aparecem, com progresso e botão de cancelar.
+    O usuário escolhe quais importar.
+    """
+    def __init__(self, existing_exes, parent=None):
         super().__init__(parent)
         self.setWindowTitle("🎮  Jogos Steam Encontrados")
         self.setMinimumSize(420, 520)
@@ -51,6 +65,11 @@ class SteamScanDialog(QDialog):
             }
             QListWidget::item          { padding:6px 10px; }
             QListWidget::item:selected { background:#3d3d7a; border-radius:4px; }
+            QProgressBar {
+                background:#1a1a2e; border:1px solid #333366; border-radius:4px;
+                height:8px; text-align:center; color:transparent;
+            }
+            QProgressBar::chunk { background:#2563eb; border-radius:3px; }
             QPushButton {
                 background:#2d2d5a; color:#fff; border:none;
                 border-radius:6px; padding:7px 18px; font-size:12px;
@@ -60,28 +79,32 @@ class SteamScanDialog(QDialog):
                 background:#2563eb; font-weight:bold; padding:8px 22px;
             }
             QPushButton#import_btn:hover { background:#3b82f6; }
+            QPushButton:disabled { background:#22223a; color:#666; }
         """)
-        self.all_games = games
+        self.existing_exes  = existing_exes
         self.selected_games = []
+        self.scan_result    = None     # dict do rescan ao terminar
+        self._total_found   = 0
+        self._cancel        = threading.Event()
         self._build_ui()
+        self._start_scan()
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(12)
 
-        layout.addWidget(QLabel(
-            f"{len(self.all_games)} jogos instalados encontrados.\n"
-            "Selecione os que deseja importar (Ctrl+A para todos):"
-        ))
+        self.status = QLabel("Procurando jogos Steam instalados…")
+        layout.addWidget(self.status)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)             # indeterminado até contar os manifests
+        layout.addWidget(self.progress)
 
         self.list_widget = QListWidget()
         self.list_widget.setSelectionMode(
             QListWidget.SelectionMode.MultiSelection)
-        for g in self.all_games:
-            item = QListWidgetItem(g["name"])
-            item.setData(Qt.ItemDataRole.UserRole, g)
-            self.list_widget.addItem(item)
+        self.list_widget.setSortingEnabled(True)
         layout.addWidget(self.list_widget)
 
         btn_row = QHBoxLayout()
@@ -89,6 +112,8 @@ class SteamScanDialog(QDialog):
         btn_all.clicked.connect(self.list_widget.selectAll)
         btn_none   = QPushButton("Desmarcar Todos")
         btn_none.clicked.connect(self.list_widget.clearSelection)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.clicked.connect(self._cancel_scan)
         btn_import = QPushButton("⬇  Importar Selecionados")
         btn_import.setObjectName("import_btn")
         btn_import.clicked.connect(self._accept)
@@ -96,9 +121,67 @@ class SteamScanDialog(QDialog):
         btn_row.addWidget(btn_all)
         btn_row.addWidget(btn_none)
         btn_row.addStretch()
+        btn_row.addWidget(self.btn_cancel)
         btn_row.addWidget(btn_import)
         layout.addLayout(btn_row)
 
+    # ── Varredura em segundo plano ─────────────────────────────────────────
+
+    def _start_scan(self):
+        signals = self._signals = _ScanSignals()
+        signals.found.connect(self._on_found)
+        signals.progress.connect(self._on_progress)
+        signals.finished.connect(self._on_finished)
+        cancel = self._cancel
+
+        def run():
+            result = steam_scanner.rescan(on_game=signals.found.emit,
+                                          on_progress=signals.progress.emit,
+                                          cancel=cancel.is_set)
+            signals.finished.emit(result)
+
+        threading.Thread(target=run, daemon=True, name="steam-scan").start()
+
+    def _cancel_scan(self):
+        self._cancel.set()
+        self.btn_cancel.setEnabled(False)
+        self.status.setText("Cancelando…")
+
+    def _on_found(self, game):
+        self._total_found += 1
+        if game["launch_cmd"] not in self.existing_exes:
+            item = QListWidgetItem(game["name"])
+            item.setData(Qt.ItemDataRole.UserRole, game)
+            self.list_widget.addItem(item)
+        self.status.setText(f"Procurando… {self.list_widget.count()} jogo(s) novo(s) "
+                            f"de {self._total_found} encontrado(s)")
+
+    def _on_progress(self, done, total):
+        self.progress.setRange(0, max(1, total))
+        self.progress.setValue(done)
+
+    def _on_finished(self, result):
+        self.progress.hide()
+        self.btn_cancel.hide()
+        new = self.list_widget.count()
+        if result is None:
+            self.status.setText(f"Varredura cancelada — {new} jogo(s) novo(s) encontrado(s).\n"
+                                "Selecione os que deseja importar (Ctrl+A para todos):")
+            return
+        self.scan_result = result
+        if not result["games"]:
+            self.status.setText("Nenhum jogo Steam instalado foi encontrado.\n"
+                                "Verifique se o Steam está instalado no caminho padrão.")
+        elif not new:
+            self.status.setText("Todos os jogos Steam já estão cadastrados no GameHub.")
+        else:
+            self.status.setText(f"{new} jogo(s) novo(s) de {len(result['games'])} instalados.\n"
+                                "Selecione os que deseja importar (Ctrl+A para todos):")
+
+    def done(self, r):
+        self._cancel.set()           # fechar o diálogo interrompe a varredura
+        super().done(r)
+
     def _accept(self):
         self.selected_games = [
             item.data(Qt.ItemDataRole.UserRole)
@@ -117,13 +200,20 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("🎮 GameHub")
         self.setMinimumSize(860, 560)
         self.resize(1200, 720)
-        self._movie      = None
+        self._wallpaper  = None   # StaticWallpaper / GifWallpaper, se houver
         self._bg_label   = None
-        self._drag_id    = None
-        self._game_order = []
+        self._dismissed  = set()  # appids já oferecidos pelo watcher e recusados
         self._build_ui()
         self._apply_theme()
         self._refresh()
+        settings_manager.notifier.changed.connect(self._on_settings_changed)
+
+        self._steam_watcher = SteamWatcher(self)
+        self._steam_watcher.changed.connect(self._on_steam_changed)
+        if settings_manager.get("steam_watch", False):
+            QTimer.singleShot(0, self._steam_watcher.start)   # depois da 1ª pintura
+        launcher.service().failed.connect(self._on_launch_failed)
+        persistence.notifier.failed.connect(self._on_save_failed)
 
     def _build_ui(self):
         self.root = QWidget(); self.root.setObjectName("root")
@@ -131,6 +221,8 @@ class MainWindow(QMainWindow):
 
         self._bg_label = QLabel(self.root)
         self._bg_label.setObjectName("bg")
+        # Frames maiores que a janela ficam centralizados e cortados pelo QLabel
+        self._bg_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self._bg_label.setGeometry(0, 0, self.width(), self.height())
         self._bg_label.lower()
 
@@ -164,14 +256,13 @@ class MainWindow(QMainWindow):
         hbox.addWidget(cfg_btn)
         vbox.addWidget(header)
 
-        # Scroll + grid
-        scroll = QScrollArea(); scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border:none; background:transparent; }")
-        self.container = QWidget(); self.container.setObjectName("container")
-        self.grid = QGridLayout(self.container)
-        self.grid.setSpacing(16); self.grid.setContentsMargins(24, 24, 24, 24)
-        scroll.setWidget(self.container)
-        vbox.addWidget(scroll)
+        # Grid virtualizado (só os cards visíveis existem)
+        self.library = LibraryView()
+        self.library.removed.connect(self._remove_game)
+        self.library.edit_requested.connect(self._edit_game)
+        self.library.order_changed.connect(game_manager.set_order)
+        self.library.governor.watch_window(self)
+        vbox.addWidget(self.library)
 
         self.empty = QLabel(
             "Nenhum jogo adicionado.\nClique em '+ Adicionar Jogo' para começar! 🎮")
@@ -179,102 +270,38 @@ class MainWindow(QMainWindow):
         self.empty.setAlignment(Qt.AlignmentFlag.AlignCenter)
         vbox.addWidget(self.empty)
 
-    def _update_bg_pixmap(self, path):
-        pix = QPixmap(path)
-        w, h = self.width(), self.height()
-        scaled = pix.scaled(
-            w, h,
-            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-            Qt.TransformationMode.SmoothTransformation)
-        x = (scaled.width()  - w) // 2
-        y = (scaled.height() - h) // 2
-        self._bg_label.setPixmap(scaled.copy(x, y, w, h))
-
     def _apply_theme(self):
-        s = settings_manager.load_settings()
+        s = settings_manager.settings()
         self.setStyleSheet(build_style(s))
 
-        if self._movie:
-            self._movie.stop()
-            self._movie = None
+        if self._wallpaper:
+            self._wallpaper.stop()
+            self._wallpaper.deleteLater()
+            self._wallpaper = None
 
         path = s.get("bg_image", "")
         ext  = os.path.splitext(path)[1].lower() if path else ""
 
-        if path and os.path.exists(path) and ext == ".gif":
-            self._bg_label.setStyleSheet("")
-            self._movie = QMovie(path)
-            self._movie.frameChanged.connect(self._update_gif_frame)
-            self._movie.start()
-        elif path and os.path.exists(path):
-            self._update_bg_pixmap(path)
+        if path and os.path.exists(path):
+            # Baixo consumo: GIF vira wallpaper estático com o 1º frame
+            animated = ext == ".gif" and performance.animate()
+            cls = GifWallpaper if animated else StaticWallpaper
             self._bg_label.setStyleSheet("")
+            self._bg_label.setPixmap(QPixmap())
+            self._wallpaper = cls(path, self.size(), self.devicePixelRatioF(), self)
+            self._wallpaper.frame_ready.connect(self._bg_label.setPixmap)
         else:
             self._bg_label.setPixmap(QPixmap())
             self._bg_label.setStyleSheet(f"background:{s['bg_color']};")
 
-    def _update_gif_frame(self):
-        if self._movie:
-            pix = self._movie.currentPixmap()
-            w, h = self.width(), self.height()
-            scaled = pix.scaled(
-                w, h,
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation)
-            x = (scaled.width()  - w) // 2
-            y = (scaled.height() - h) // 2
-            self._bg_label.setPixmap(scaled.copy(x, y, w, h))
-
     def _refresh(self):
-        while self.grid.count():
-            w = self.grid.takeAt(0).widget()
-            if w: w.deleteLater()
-
-        games = game_manager.load_games()
-
-        order = settings_manager.load_settings().get("game_order", [])
-        if order:
-            id_map  = {g["id"]: g for g in games}
-            ordered = [id_map[i] for i in order if i in id_map]
-            known   = set(order)
-            ordered += [g for g in games if g["id"] not in known]
-            games   = ordered
-
-        self._game_order = [g["id"] for g in games]
+        games = game_manager.load_games()   # já na ordem de exibição
+        self.library.set_games(games)
 
         if not games:
-            self.container.hide(); self.empty.show(); return
-
-        self.empty.hide(); self.container.show()
-        cols = max(2, (self.width() - 48) // (185 + 16))
-        for i, game in enumerate(games):
-            card = GameCard(game)
-            card.removed.connect(self._remove_game)
-            card.edit_requested.connect(self._edit_game)
-            card.drag_moved.connect(self._on_card_drag)
-            self.grid.addWidget(card, i // cols, i % cols)
-
-    def _on_card_drag(self, game_id, global_pos):
-        local_pos = self.container.mapFromGlobal(global_pos)
-        target_id = None
-        for i in range(self.grid.count()):
-            item = self.grid.itemAt(i)
-            if item and item.widget():
-                w = item.widget()
-                if w.geometry().contains(local_pos):
-                    target_id = w.game["id"]
-                    break
-
-        if target_id and target_id != game_id:
-            i1 = self._game_order.index(game_id)
-            i2 = self._game_order.index(target_id)
-            self._game_order[i1], self._game_order[i2] = \
-                self._game_order[i2], self._game_order[i1]
-            s = settings_manager.load_settings()
-            s["game_order"] = self._game_order
-            settings_manager.save_settings(s)
-            self._drag_id = None
-            self._refresh()
+            self.library.hide(); self.empty.show(); return
+
+        self.empty.hide(); self.library.show()
 
     def _add_game(self):
         dlg = AddGameDialog(self)
@@ -285,10 +312,9 @@ class MainWindow(QMainWindow):
             self._refresh()
 
     def _edit_game(self, gid):
-        games = game_manager.load_games()
-        game  = next((g for g in games if g["id"] == gid), None)
+        game = game_manager.get_game(gid)
         if not game: return
-        dlg = AddGameDialog(self, game=game)
+        dlg = AddGameDialog(self, game=game.to_dict())
         if dlg.exec():
             d = dlg.get_data()
             game_manager.edit_game(d["id"], d["name"], d["exe_path"],
@@ -299,51 +325,131 @@ class MainWindow(QMainWindow):
         game_manager.remove_game(gid)
         self._refresh()
 
-    def _scan_steam(self):
-        games = scan_steam_games()
-        if not games:
-            QMessageBox.information(
-                self, "Steam",
-                "Nenhum jogo Steam instalado foi encontrado.\n"
-                "Verifique se o Steam está instalado no caminho padrão.")
-            return
-
-        # Filtra jogos já cadastrados pelo launch_cmd
-        existing_exes = {g.get("exe_path") for g in game_manager.load_games()}
-        new_games = [g for g in games if g["launch_cmd"] not in existing_exes]
+    def _on_save_failed(self, path, message):
+        # Disco cheio, arquivo travado… — sem console, só a interface avisa
+        QMessageBox.warning(self, "Falha ao salvar",
+                            f"Não foi possível gravar {os.path.basename(path)}:\n{message}\n\n"
+                            "As alterações recentes podem não ter sido salvas.")
+
+    def _on_launch_failed(self, game_id, message):
+        # Sem console no executável: o erro precisa aparecer na interface
+        game = game_manager.get_game(game_id)
+        QMessageBox.warning(self, "Não foi possível abrir",
+                            f"{game.name if game else 'Jogo'}:\n{message}")
+
+    def _flag_uninstalled(self, installed=None, gone_ids=(), back_ids=()):
+        """
+        Marca (extra: steam_uninstalled) os jogos Steam da biblioteca cujo
+        manifest sumiu e desmarca os reinstalados — uma gravação só.
+        Com `installed` (varredura completa) todos os jogos Steam são
+        avaliados; sem ele, só os appids de gone_ids/back_ids (watcher).
+        Retorna os nomes dos que acabaram de ser marcados.
+        """
+        flagged = []
+        with game_manager.transaction():
+            for game in game_manager.load_games():
+                if not game.exe_path.startswith("steam://rungameid/"):
+                    continue
+                appid = game.exe_path.rsplit("/", 1)[1]
+                if installed is not None:
+                    gone = appid not in installed
+                elif appid in gone_ids or appid in back_ids:
+                    # Nos dois: o jogo mudou de biblioteca — continua instalado
+                    gone = appid in gone_ids and appid not in back_ids
+                else:
+                    continue
+                if gone != bool(game.extra.get("steam_uninstalled")):
+                    extra = {k: v for k, v in game.extra.items() if k != "steam_uninstalled"}
+                    if gone:
+                        extra["steam_uninstalled"] = True
+                        flagged.append(game.name)
+                    game_manager.get_store().update(game.id, extra=extra)
+        return flagged
 
-        if not new_games:
-            QMessageBox.information(
-                self, "Steam",
-                "Todos os jogos Steam já estão cadastrados no GameHub.")
-            return
-
-        dlg = SteamScanDialog(new_games, parent=self)
-        if dlg.exec() and dlg.selected_games:
-            for g in dlg.selected_games:
-                game_manager.add_game(
-                    name        = g["name"],
-                    exe_path    = g["launch_cmd"],
-                    icon_path   = "",
-                    banner_path = "",
-                )
+    def _scan_steam(self):
+        # A varredura roda em segundo plano dentro do diálogo
+        existing_exes = {g.exe_path for g in game_manager.load_games()}
+        dlg = SteamScanDialog(existing_exes, parent=self)
+        accepted = dlg.exec()
+
+        result = dlg.scan_result
+        if result:
+            # Sempre contra a lista completa: a diferença desde a última
+            # varredura pode já ter sido consumida (linha de base do watcher)
+            flagged = self._flag_uninstalled({g["appid"] for g in result["games"]})
+            self._refresh()
+            if flagged:
+                QMessageBox.information(
+                    self, "Steam",
+                    f"{len(flagged)} jogo(s) da biblioteca não estão mais instalados:\n"
+                    + "\n".join(f"• {name}" for name in flagged[:10]))
+
+        if accepted and dlg.selected_games:
+            with_art = self._import_steam(dlg.selected_games)
+            missing  = len(dlg.selected_games) - with_art
             QMessageBox.information(
                 self, "Importado!",
                 f"{len(dlg.selected_games)} jogo(s) importado(s) com sucesso!\n"
-                "Você pode adicionar ícone e banner clicando em ✏️ Editar.")
+                f"{with_art} com capa do cache local do Steam."
+                + (f"\nPara os outros {missing}, adicione ícone e banner em ✏️ Editar."
+                   if missing else ""))
             self._refresh()
 
+    def _import_steam(self, games):
+        """
+        Adiciona jogos Steam (dicts do steam_scanner) já com a arte que o
+        Steam guardou no librarycache — sem rede. Retorna quantos vieram
+        com arte.
+        """
+        art = steam_scanner.local_artwork(g["appid"] for g in games)
+        game_manager.add_games(
+            {"name": g["name"], "exe_path": g["launch_cmd"], **art.get(g["appid"], {})}
+            for g in games
+        )
+        return sum(1 for g in games if g["appid"] in art)
+
+    def _on_steam_changed(self, added, removed):
+        """Watcher: jogos instalados/desinstalados sem varredura completa."""
+        self._flag_uninstalled(gone_ids={g["appid"] for g in removed},
+                               back_ids={g["appid"] for g in added})
+        self._refresh()
+        existing = {g.exe_path for g in game_manager.load_games()}
+        new = [g for g in added
+               if g["launch_cmd"] not in existing and g["appid"] not in self._dismissed]
+        if not new:
+            return
+        names = "\n".join(f"• {g['name']}" for g in new[:10])
+        answer = QMessageBox.question(
+            self, "Steam",
+            f"{len(new)} novo(s) jogo(s) Steam encontrado(s):\n{names}\n\n"
+            "Importar para o GameHub agora?")
+        if answer == QMessageBox.StandardButton.Yes:
+            self._import_steam(new)
+            self._refresh()
+        else:
+            self._dismissed.update(g["appid"] for g in new)
+
     def _open_settings(self):
-        dlg = SettingsDialog(self)
-        if dlg.exec():
+        # Tema e backend são aplicados por _on_settings_changed ao salvar
+        SettingsDialog(self).exec()
+
+    def _on_settings_changed(self, keys):
+        if keys & THEME_KEYS:
             self._apply_theme()
+        if "steam_watch" in keys:
+            if settings_manager.get("steam_watch", False):
+                self._steam_watcher.start()
+            else:
+                self._steam_watcher.stop()
+        if "storage_backend" in keys:
+            game_manager.use_backend(settings_manager.get("storage_backend", "json"))
+            self._refresh()
 
     def resizeEvent(self, e):
         super().resizeEvent(e)
         self._bg_label.setGeometry(0, 0, self.width(), self.height())
-        s    = settings_manager.load_settings()
-        path = s.get("bg_image", "")
-        ext  = os.path.splitext(path)[1].lower() if path else ""
-        if path and os.path.exists(path) and ext != ".gif":
-            self._update_bg_pixmap(path)
-        self._refresh()
+        # Resize barato: o wallpaper estica o último frame e só refaz a versão
+        # suave (fora da thread da GUI) quando o tamanho assentar; o grid só
+        # reposiciona os cards já montados (LibraryView.resizeEvent).
+        if self._wallpaper:
+            self._wallpaper.resize(self.size())
@@ -0,0 +1,42 @@
+from PyQt6.QtCore import Qt
+import settings_manager
+
+
+# Perfis de desempenho (configuração "performance_profile")
+#   animate    — GIFs (ícones, banners, wallpaper) animam; senão só o 1º frame
+#   hover_fade — fade animado no hover; senão troca instantânea
+#   smooth     — SmoothTransformation ao escalar; senão FastTransformation
+#   max_fps    — teto do relógio de animação (None = só o animation_fps)
+PROFILES = {
+    "full":     {"animate": True,  "hover_fade": True,  "smooth": True,  "max_fps": None},
+    "balanced": {"animate": True,  "hover_fade": True,  "smooth": True,  "max_fps": 30},
+    "low":      {"animate": False, "hover_fade": False, "smooth": False, "max_fps": None},
+}
+DEFAULT_PROFILE = "full"
+
+
+def profile():
+    """Flags do perfil atual (perfil desconhecido cai no padrão)."""
+    name = settings_manager.get("performance_profile", DEFAULT_PROFILE)
+    return PROFILES.get(name, PROFILES[DEFAULT_PROFILE])
+
+
+def animate():
+    return profile()["animate"]
+
+
+def hover_fade():
+    return profile()["hover_fade"]
+
+
+def transform():
+    """Modo de transformação para escalas feitas em tempo de execução."""
+    return (Qt.TransformationMode.SmoothTransformation if profile()["smooth"]
+            else Qt.TransformationMode.FastTransformation)
+
+
+def fps():
+    """FPS efetivo do relógio: animation_fps limitado pelo teto do perfil."""
+    value = int(settings_manager.get("animation_fps", 60))
+    cap   = profile()["max_fps"]
+    return min(value, cap) if cap else value
@@ -0,0 +1,113 @@
+import atexit, json, os, tempfile, threading, time
+from PyQt6.QtCore import QObject, pyqtSignal
+
+DEBOUNCE = 0.4   # segundos sem novas mutações antes de gravar
+
+_writers = []
+
+
+class _Notifier(QObject):
+    failed = pyqtSignal(str, str)   # caminho, mensagem (emitido da thread de gravação)
+
+notifier = _Notifier()
+
+
+def atomic_write_json(path, data):
+    """
+    Grava JSON de forma atômica: arquivo temporário na mesma pasta,
+    fsync e os.replace — um crash no meio nunca deixa o arquivo corrompido.
+    """
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class DebouncedWriter:
+    """
+    Write-behind de um arquivo (JSON por padrão).
+    schedule() só registra o snapshot e retorna na hora; uma thread em
+    segundo plano grava depois de DEBOUNCE segundos sem novos pedidos,
+    então rajadas de mutações viram uma única escrita.
+    `write(path, dados)` define como gravar (padrão: JSON atômico).
+    Uma falha de gravação é avisada em notifier.failed — uma vez, até a
+    próxima gravação bem-sucedida desse arquivo.
+    """
+    def __init__(self, path, delay=DEBOUNCE, write=None):
+        self.path      = path
+        self.delay     = delay
+        self._do_write = write or atomic_write_json
+        self._cond     = threading.Condition()
+        self._io_lock  = threading.Lock()   # serializa gravações (worker × flush)
+        self._pending  = None               # callable → dados a gravar
+        self._deadline = 0.0
+        self._thread   = None
+        self._failing  = False
+        _writers.append(self)
+
+    def schedule(self, snapshot):
+        """snapshot: callable sem argumentos, chamado na thread de gravação."""
+        with self._cond:
+            self._pending  = snapshot
+            self._deadline = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True,
+                    name=f"writer:{os.path.basename(self.path)}")
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """Grava imediatamente o que estiver pendente (bloqueante)."""
+        with self._io_lock:
+            with self._cond:
+                snapshot, self._pending = self._pending, None
+            if snapshot:
+                self._write(snapshot)
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while self._pending is None:
+                        self._cond.wait()
+                    while self._pending is not None:
+                        remaining = self._deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                self.flush()
+        finally:
+            # Se a thread morrer, o próximo schedule() cria outra
+            with self._cond:
+                self._thread = None
+
+    def _write(self, snapshot):
+        try:
+            self._do_write(self.path, snapshot())
+        except Exception as e:            # um erro não pode matar o writer
+            if not self._failing:
+                self._failing = True
+                notifier.failed.emit(self.path, str(e))
+        else:
+            self._failing = False
+
+
+def flush_all():
+    """Descarrega todos os writers — chamado ao fechar o app."""
+    for w in list(_writers):
+        w.flush()
+
+
+atexit.register(flush_all)
@@ -0,0 +1,44 @@
+from PyQt6.QtCore import QObject, QEvent
+
+
+class PlaybackGovernor(QObject):
+    """
+    Decide quais cards podem animar seus GIFs.
+    Um card só anima se estiver na área visível do grid e a janela estiver
+    ativa e não minimizada; os demais ficam pausados no frame atual.
+    (O banner, além disso, só roda durante o hover — ver GameCard.)
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._window    = None
+        self._window_ok = True
+        self._on_screen = set()    # cards visíveis no viewport
+        self._cards     = set()    # todos os cards conhecidos (inclui pool)
+
+    def watch_window(self, window):
+        self._window = window
+        window.installEventFilter(self)
+        self._update_window_state()
+
+    def set_cards(self, on_screen, all_cards):
+        self._on_screen = set(on_screen)
+        self._cards     = set(all_cards)
+        self._apply()
+
+    def eventFilter(self, obj, e):
+        if obj is self._window and e.type() in (
+                QEvent.Type.WindowStateChange, QEvent.Type.ActivationChange,
+                QEvent.Type.Hide, QEvent.Type.Show):
+            self._update_window_state()
+        return False
+
+    def _update_window_state(self):
+        w  = self._window
+        ok = w.isVisible() and not w.isMinimized() and w.isActiveWindow()
+        if ok != self._window_ok:
+            self._window_ok = ok
+            self._apply()
+
+    def _apply(self):
+        for card in self._cards:
+            card.set_animation_allowed(self._window_ok and card in self._on_screen)
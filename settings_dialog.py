@@ -1,12 +1,12 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                               QPushButton, QFileDialog, QColorDialog,
                               QFrame, QScrollArea, QWidget, QMessageBox,
-                              QLineEdit)
+                              QLineEdit, QComboBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QPixmap, QMovie, QCursor
 from image_cropper import ImageCropper
 from color_extractor import auto_theme_from_image
-import settings_manager, os
+import settings_manager, artwork_cache, performance, os
 
 
 def build_style(s):
@@ -42,6 +42,14 @@ def build_style(s):
         border-radius:6px; padding:6px 10px; color:{text}; font-size:12px;
     }}
     QLineEdit:focus {{ border-color:{accent}; }}
+    QComboBox {{
+        background:#1e1e3a; border:1px solid {border};
+        border-radius:6px; padding:6px 10px; color:{text}; font-size:12px;
+    }}
+    QComboBox:focus {{ border-color:{accent}; }}
+    QComboBox QAbstractItemView {{
+        background:#1e1e3a; color:{text}; selection-background-color:{accent};
+    }}
     QPushButton {{
         background:{btn_bg};
         color:{text};
@@ -124,7 +132,7 @@ class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("⚙️  Configurações")
-        self.setFixedSize(520, 650)   # altura aumentada para nova seção
+        self.setFixedSize(520, 700)   # altura aumentada para nova seção
         self._s = settings_manager.load_settings()
         self.setStyleSheet(build_style(self._s))
         self._build_ui()
@@ -235,6 +243,75 @@ class SettingsDialog(QDialog):
         key_row.addWidget(btn_show_key)
         layout.addLayout(key_row)
 
+        watch_row = QHBoxLayout()
+        lbl_watch = QLabel("Detecção de jogos Steam:")
+        lbl_watch.setFixedWidth(200)
+        self._watch_combo = QComboBox()
+        self._watch_combo.addItem("Manual (botão 🔍 Steam)",       False)
+        self._watch_combo.addItem("Automática (observar pastas)", True)
+        self._watch_combo.setToolTip(
+            "Automática: avisa quando um jogo é instalado ou desinstalado\n"
+            "no Steam, lendo só os manifests que mudaram.")
+        self._set_combo(self._watch_combo, bool(self._s.get("steam_watch", False)))
+        watch_row.addWidget(lbl_watch)
+        watch_row.addWidget(self._watch_combo, 1)
+        layout.addLayout(watch_row)
+
+        self._divider(layout)
+
+        # ── Armazenamento ──────────────────────────────────
+        self._section(layout, "💾  Armazenamento")
+
+        storage_row = QHBoxLayout()
+        lbl_storage = QLabel("Biblioteca de jogos:")
+        lbl_storage.setFixedWidth(200)
+        self._storage_combo = QComboBox()
+        self._storage_combo.addItem("JSON (games.json)",   "json")
+        self._storage_combo.addItem("SQLite (games.db)",   "sqlite")
+        self._storage_combo.setToolTip(
+            "SQLite grava só os jogos alterados — indicado para bibliotecas grandes.\n"
+            "Ao trocar, os dados atuais são copiados para o novo formato.")
+        self._set_combo(self._storage_combo, self._s.get("storage_backend", "json"))
+        storage_row.addWidget(lbl_storage)
+        storage_row.addWidget(self._storage_combo, 1)
+        layout.addLayout(storage_row)
+
+        self._divider(layout)
+
+        # ── Desempenho ─────────────────────────────────────
+        self._section(layout, "⚡  Desempenho")
+
+        profile_row = QHBoxLayout()
+        lbl_profile = QLabel("Perfil de desempenho:")
+        lbl_profile.setFixedWidth(200)
+        self._profile_combo = QComboBox()
+        self._profile_combo.addItem("Completo",          "full")
+        self._profile_combo.addItem("Equilibrado",       "balanced")
+        self._profile_combo.addItem("Baixo consumo",     "low")
+        self._profile_combo.setToolTip(
+            "Completo: todas as animações.\n"
+            "Equilibrado: animações limitadas a 30 FPS.\n"
+            "Baixo consumo: GIFs parados no 1º frame, sem fade no hover\n"
+            "e redimensionamento rápido — para rodar junto com o jogo.")
+        self._set_combo(self._profile_combo, self._s.get("performance_profile", "full"))
+        profile_row.addWidget(lbl_profile)
+        profile_row.addWidget(self._profile_combo, 1)
+        layout.addLayout(profile_row)
+
+        fps_row = QHBoxLayout()
+        lbl_fps = QLabel("Limite de FPS das animações:")
+        lbl_fps.setFixedWidth(200)
+        self._fps_combo = QComboBox()
+        for fps in (24, 30, 60, 120, 144):
+            self._fps_combo.addItem(f"{fps} FPS", fps)
+        self._fps_combo.setToolTip(
+            "Hover dos cards, GIFs e wallpaper animado avançam juntos neste ritmo.\n"
+            "Valores menores economizam CPU/GPU.")
+        self._set_combo(self._fps_combo, self._s.get("animation_fps", 60))
+        fps_row.addWidget(lbl_fps)
+        fps_row.addWidget(self._fps_combo, 1)
+        layout.addLayout(fps_row)
+
         self._divider(layout)
 
         # ── Botões de ação ─────────────────────────────────
@@ -256,6 +333,10 @@ class SettingsDialog(QDialog):
         line.setFrameShape(QFrame.Shape.HLine)
         layout.addWidget(line)
 
+    def _set_combo(self, combo, value):
+        idx = combo.findData(value)
+        combo.setCurrentIndex(max(0, idx))
+
     def _update_bg_preview(self):
         path = self._s.get("bg_image", "")
         if path and os.path.exists(path):
@@ -266,15 +347,13 @@ class SettingsDialog(QDialog):
                 frame = movie.currentPixmap().scaled(
                     200, 112,
                     Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                    Qt.TransformationMode.SmoothTransformation)
+                    performance.transform())
                 self._bg_preview.setPixmap(frame)
                 self._bg_preview.setText("")
             else:
-                pix = QPixmap(path).scaled(
-                    200, 112,
-                    Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                    Qt.TransformationMode.SmoothTransformation)
-                self._bg_preview.setPixmap(pix)
+                pix = artwork_cache.get_pixmap(
+                    path, 200, 112, self.devicePixelRatioF())
+                self._bg_preview.setPixmap(pix or QPixmap())
                 self._bg_preview.setText("")
         else:
             self._bg_preview.setPixmap(QPixmap())
@@ -324,6 +403,10 @@ class SettingsDialog(QDialog):
             btn._color = self._s[key]
             btn._update_style()
         self._sgdb_key_input.setText("")
+        self._set_combo(self._storage_combo, self._s["storage_backend"])
+        self._set_combo(self._fps_combo, self._s["animation_fps"])
+        self._set_combo(self._profile_combo, self._s["performance_profile"])
+        self._set_combo(self._watch_combo, self._s["steam_watch"])
         self.setStyleSheet(build_style(self._s))
         self._update_bg_preview()
 
@@ -331,5 +414,9 @@ class SettingsDialog(QDialog):
         for key, btn in self._color_btns.items():
             self._s[key] = btn.color()
         self._s["sgdb_api_key"] = self._sgdb_key_input.text().strip()
+        self._s["storage_backend"] = self._storage_combo.currentData()
+        self._s["animation_fps"]   = self._fps_combo.currentData()
+        self._s["performance_profile"] = self._profile_combo.currentData()
+        self._s["steam_watch"] = self._watch_combo.currentData()
         settings_manager.save_settings(self._s)
         self.accept()
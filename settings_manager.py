@@ -1,4 +1,6 @@
 import json, os
+from PyQt6.QtCore import QObject, pyqtSignal
+from persistence import DebouncedWriter
 
 DATA_FILE = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")),
                          "GameHub", "settings.json")
@@ -10,17 +12,62 @@ DEFAULTS = {
     "header_color": "#131330",
     "card_border":  "#383868",
     "text_color":   "#e2e8f0",
-    "game_order":   [],
+    "game_order":   [],   # legado: migrado para a chave "order" de cada jogo
+    "storage_backend": "json",   # "json" ou "sqlite"
+    "artwork_cache_mb": 128,     # orçamento do cache de arte decodificada
+    "thumb_cache_mb":   256,     # limite das miniaturas em disco (pasta thumbs)
+    "animation_cache_mb": 64,    # frames de GIF decodificados em memória
+    "wallpaper_cache_mb": 192,   # frames pré-escalados do wallpaper GIF
+    "animation_fps":      60,    # limite de quadros/s do relógio de animação
+    "performance_profile": "full",   # full | balanced | low (ver performance.py)
+    "steam_watch":        False, # observar as pastas steamapps (novos jogos)
 }
 
+
+class _Notifier(QObject):
+    changed = pyqtSignal(object)   # set com as chaves que mudaram
+
+
+notifier = _Notifier()
+_writer  = DebouncedWriter(DATA_FILE)
+_current = None   # cópia única em memória; o disco é lido só na primeira vez
+
+def _cached():
+    global _current
+    if _current is None:
+        data = {}
+        if os.path.exists(DATA_FILE):
+            with open(DATA_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        _current = {**DEFAULTS, **data}
+    return _current
+
+def settings():
+    """Configurações em cache (somente leitura — use save_settings/update)."""
+    return _cached()
+
+def get(key, default=None):
+    return _cached().get(key, default)
+
 def load_settings():
-    if not os.path.exists(DATA_FILE):
-        return dict(DEFAULTS)
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return {**DEFAULTS, **data}
+    """Cópia das configurações, para editar e depois passar a save_settings."""
+    return dict(_cached())
 
 def save_settings(settings):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2, ensure_ascii=False)
+    """
+    Atualiza o cache, agenda a gravação atômica em segundo plano e emite
+    notifier.changed com as chaves alteradas. Retorna na hora.
+    """
+    global _current
+    old      = _cached()
+    _current = snapshot = {**DEFAULTS, **settings}
+    _writer.schedule(lambda: snapshot)
+    keys = {k for k in old.keys() | snapshot.keys() if old.get(k) != snapshot.get(k)}
+    if keys:
+        notifier.changed.emit(keys)
+
+def update(**changes):
+    save_settings({**_cached(), **changes})
+
+def flush():
+    _writer.flush()
@@ -1,5 +1,14 @@
+import json
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from persistence import atomic_write_json
+
+INDEX_FILE = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")),
+                          "GameHub", "steam_index.json")
+INDEX_VERSION = 1
+MAX_SCAN_THREADS = 8     # uma thread por biblioteca (HDs/rede diferentes em paralelo)
 
 def _get_steam_path():
     try:
@@ -21,57 +30,435 @@ def _get_steam_path():
     return r"C:\Program Files (x86)\Steam"
 
 
-def _parse_library_paths(vdf_text):
-    """Extrai todos os caminhos de bibliotecas do libraryfolders.vdf."""
-    paths = []
-    for m in re.finditer(r'"path"\s+"([^"]+)"', vdf_text):
-        p = m.group(1).replace("\\\\", "\\")
-        if os.path.isdir(p):
-            paths.append(p)
-    return paths
+# ── KeyValues (VDF/ACF) ───────────────────────────────────────────────────────
+#
+# Um único regex percorre o texto uma vez, casando de cada vez um par
+# "chave" "valor", uma "chave" seguida de { (abre seção), um } ou um
+# comentário //. Os tokens saem um a um (finditer), então quem só precisa
+# do começo do arquivo para de ler ali — nada de re.search por chave nem
+# lista de tokens montada antes. Texto fora desses padrões (condicionais
+# [$WIN32], palavras sem aspas) é pulado pelo próprio regex.
 
+_STR    = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_TOKEN  = re.compile(_STR + r'\s*(?:' + _STR + r'|(\{))|(\})|//[^\n]*')
+_PAIR, _OPEN, _CLOSE = 2, 3, 4          # m.lastindex de cada tipo (comentário: None)
+_ESCAPE = re.compile(r'\\(.)')
+_ESCAPES = {"n": "\n", "t": "\t"}
 
-def _parse_acf(text):
-    """Extrai nome, appid e installdir de um appmanifest_*.acf."""
-    def val(key):
-        m = re.search(rf'"{key}"\s+"([^"]+)"', text, re.IGNORECASE)
-        return m.group(1) if m else ""
-    appid = val("appid")
-    name  = val("name")
-    return {"appid": appid, "name": name} if appid and name else None
+
+def _unescape(s):
+    return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), s) if "\\" in s else s
 
 
-def scan_steam_games():
+def parse_vdf(text):
     """
-    Retorna lista de dicts:
-      { "name": str, "appid": str, "launch_cmd": str }
+    Converte um texto KeyValues (libraryfolders.vdf, appmanifest_*.acf) num
+    dict aninhado em uma passada. Chaves repetidas: vale a última.
     """
-    steam_path = _get_steam_path()
+    root  = {}
+    stack = [root]
+    cur   = root
+    for m in _TOKEN.finditer(text):
+        kind = m.lastindex
+        if kind == _PAIR:
+            cur[_unescape(m[1])] = _unescape(m[2])
+        elif kind == _OPEN:
+            child = cur[_unescape(m[1])] = {}
+            stack.append(child)
+            cur = child
+        elif kind == _CLOSE and len(stack) > 1:
+            stack.pop()
+            cur = stack[-1]
+    return root
+
+
+def _field(section, key, default=""):
+    """Busca sem diferenciar maiúsculas (o Steam grava 'AppState'/'appstate')."""
+    if key in section:
+        return section[key]
+    low = key.lower()
+    for k, v in section.items():
+        if k.lower() == low:
+            return v
+    return default
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _read_vdf(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return parse_vdf(f.read())
+    except OSError:
+        return None
+
+
+# ── Bibliotecas e manifests ───────────────────────────────────────────────────
+
+def library_folders(steam_path=None):
+    """
+    Lista as bibliotecas Steam (a padrão primeiro):
+      { "path": str, "steamapps": str, "label": str, "apps": {appid: bytes} }
+    Entende o libraryfolders.vdf novo (seções com path/apps) e o antigo
+    ("1" "D:\\SteamLibrary").
+    """
+    steam_path  = steam_path or _get_steam_path()
     default_lib = os.path.join(steam_path, "steamapps")
-    lib_paths = [default_lib]
-
-    vdf_path = os.path.join(default_lib, "libraryfolders.vdf")
-    if os.path.exists(vdf_path):
-        with open(vdf_path, "r", encoding="utf-8", errors="ignore") as f:
-            extra = _parse_library_paths(f.read())
-        lib_paths += [os.path.join(p, "steamapps") for p in extra]
-
-    games = []
-    seen = set()
-    for lib in lib_paths:
-        if not os.path.isdir(lib):
+    libs = {os.path.normcase(os.path.normpath(steam_path)):
+            {"path": steam_path, "steamapps": default_lib, "label": "", "apps": {}}}
+
+    data = _read_vdf(os.path.join(default_lib, "libraryfolders.vdf")) or {}
+    root = _field(data, "libraryfolders", {})
+    for key, entry in root.items() if isinstance(root, dict) else ():
+        if isinstance(entry, dict):
+            path  = _field(entry, "path")
+            label = _field(entry, "label")
+            apps  = _field(entry, "apps", {})
+            apps  = {a: _int(s) for a, s in apps.items()} if isinstance(apps, dict) else {}
+        elif key.isdigit():
+            path, label, apps = entry, "", {}
+        else:
             continue
-        for fname in os.listdir(lib):
-            if not (fname.startswith("appmanifest_") and fname.endswith(".acf")):
-                continue
+        if not path or not os.path.isdir(path):
+            continue
+        norm = os.path.normcase(os.path.normpath(path))
+        lib  = libs.setdefault(norm, {"path": path, "steamapps": os.path.join(path, "steamapps"),
+                                      "label": "", "apps": {}})
+        lib["label"] = label or lib["label"]
+        lib["apps"].update(apps)
+    return list(libs.values())
+
+
+_ACF_FIELDS = {      # chave no manifest (minúscula) → campo do jogo
+    "appid": "appid", "name": "name", "installdir": "installdir",
+    "sizeondisk": "size_on_disk", "lastupdated": "last_updated",
+    "stateflags": "state_flags",
+}
+_ACF_COUNT = len(_ACF_FIELDS)
+
+
+def _parse_acf(text):
+    """
+    Extrai os campos de um appmanifest_*.acf:
+      appid, name, installdir, size_on_disk, last_updated, state_flags
+    Lê só o primeiro nível da seção AppState e para assim que os seis
+    campos aparecem — InstalledDepots, UserConfig etc. nem são tokenizados.
+    """
+    fields, depth = {}, 0
+    for m in _TOKEN.finditer(text):
+        kind = m.lastindex
+        if kind == _PAIR:
+            if depth == 1:
+                field = _ACF_FIELDS.get(m[1].lower())
+                if field:
+                    value = m[2]
+                    fields[field] = _unescape(value) if "\\" in value else value
+                    if len(fields) == _ACF_COUNT:
+                        break
+        elif kind == _OPEN:
+            if depth == 0 and m[1].lower() != "appstate":
+                return None
+            depth += 1
+        elif kind == _CLOSE:
+            depth -= 1
+            if depth <= 0:
+                break
+    appid = fields.get("appid")
+    name  = fields.get("name")
+    if not (appid and name):
+        return None
+    return {
+        "appid":        appid,
+        "name":         name,
+        "installdir":   fields.get("installdir", ""),
+        "size_on_disk": _int(fields.get("size_on_disk")),
+        "last_updated": _int(fields.get("last_updated")),
+        "state_flags":  _int(fields.get("state_flags")),
+    }
+
+
+def _is_manifest(fname):
+    return fname.startswith("appmanifest_") and fname.endswith(".acf")
+
+
+def _parse_manifest(path, lib):
+    """Lê e interpreta um manifest; None se ilegível ou incompleto."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            game = _parse_acf(f.read())
+    except OSError:
+        return None
+    if game:
+        steamapps = os.path.dirname(path)
+        game["launch_cmd"]   = f"steam://rungameid/{game['appid']}"
+        game["library"]      = lib["path"]
+        game["install_path"] = os.path.join(steamapps, "common", game["installdir"])
+    return game
+
+
+# ── Arte local (appcache/librarycache) ────────────────────────────────────────
+#
+# O cliente Steam já guarda as capas dos apps da conta em
+# appcache/librarycache — importar com elas não faz nenhuma requisição.
+# Layout antigo: arquivos soltos "<appid>_library_600x900.jpg".
+# Layout novo: pasta "<appid>/" com "library_600x900.jpg" etc., às vezes
+# dentro de uma subpasta com hash. O layout novo tem prioridade.
+
+ARTWORK = {      # campo do jogo → nomes no cache, do preferido ao reserva
+    "icon_path":   ("library_600x900_2x", "library_600x900", "library_capsule"),
+    "banner_path": ("library_hero", "header"),
+}
+_ART_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def librarycache_path(steam_path=None):
+    return os.path.join(steam_path or _get_steam_path(), "appcache", "librarycache")
+
+
+def _art_files(path, files, depth=1):
+    """Junta {nome sem extensão: caminho} de uma pasta <appid>/ (e subpastas)."""
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                if e.is_dir():
+                    subdirs.append(e.path)
+                else:
+                    stem, ext = os.path.splitext(e.name)
+                    if ext.lower() in _ART_EXTS:
+                        files.setdefault(stem.lower(), e.path)
+    except OSError:
+        return
+    if depth:
+        for sub in sorted(subdirs):
+            _art_files(sub, files, depth - 1)
+
+
+def local_artwork(appids, steam_path=None):
+    """
+    Procura a arte já baixada pelo Steam para cada appid:
+      { appid: {"icon_path": str, "banner_path": str} }
+    icon_path é a capa retrato (600x900, mesmo formato do card) e
+    banner_path a imagem "hero" (ou o header). Appids sem nenhuma arte
+    ficam de fora. Uma única listagem do librarycache para todos.
+    """
+    wanted = {str(a) for a in appids}
+    flat, folder = {}, {}
+    try:
+        with os.scandir(librarycache_path(steam_path)) as it:
+            for e in it:
+                if e.is_dir():
+                    if e.name in wanted:
+                        _art_files(e.path, folder.setdefault(e.name, {}))
+                    continue
+                appid, sep, rest = e.name.partition("_")
+                stem, ext = os.path.splitext(rest)
+                if sep and appid in wanted and ext.lower() in _ART_EXTS:
+                    flat.setdefault(appid, {}).setdefault(stem.lower(), e.path)
+    except OSError:
+        return {}
+
+    result = {}
+    for appid in flat.keys() | folder.keys():
+        files = {**flat.get(appid, {}), **folder.get(appid, {})}
+        art = {field: next((files[n] for n in names if n in files), "")
+               for field, names in ARTWORK.items()}
+        if any(art.values()):
+            result[appid] = art
+    return result
+
+
+# ── Índice persistente da varredura ───────────────────────────────────────────
+
+class _Progress:
+    """Contador compartilhado pelas threads de varredura (feito / total)."""
+    def __init__(self, callback):
+        self._callback = callback
+        self._lock = threading.Lock()
+        self.done = self.total = 0
+
+    def add_total(self, n):
+        with self._lock:
+            self.total += n
+            done, total = self.done, self.total
+        if self._callback:
+            self._callback(done, total)
+
+    def step(self):
+        with self._lock:
+            self.done += 1
+            done, total = self.done, self.total
+        if self._callback:
+            self._callback(done, total)
+
+
+class ScanIndex:
+    """
+    Índice da última varredura (steam_index.json na pasta de dados):
+    caminho do manifest → mtime, tamanho e o resultado já interpretado.
+    Uma nova varredura só lista as pastas steamapps (os.scandir, uma thread
+    por biblioteca) e reinterpreta os manifests novos ou alterados.
+    Manifests que sumiram viram "removidos" (jogos desinstalados) —
+    bibliotecas inacessíveis (HD desconectado) são mantidas como estão.
+    """
+    def __init__(self, path=INDEX_FILE):
+        self.path    = path
+        self.entries = {}        # caminho → {"mtime": ns, "size": int, "game": dict | None}
+        self._lock   = threading.Lock()   # uma varredura por vez
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("manifests", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def save(self):
+        try:
+            atomic_write_json(self.path, {"version": INDEX_VERSION, "manifests": self.entries})
+        except OSError:
+            pass
+
+    def _scan_library(self, lib, progress, emit, cancel):
+        """Varre uma pasta steamapps; roda numa thread por biblioteca."""
+        steamapps = lib["steamapps"]
+        try:
+            with os.scandir(steamapps) as it:
+                manifests = [e for e in it if _is_manifest(e.name)]
+        except OSError:
+            # Biblioteca fora do ar: mantém o que já se sabia dela
+            prefix = os.path.join(steamapps, "")
+            return {p: e for p, e in self.entries.items() if p.startswith(prefix)}, 0
+        progress.add_total(len(manifests))
+        found, reparsed = {}, 0
+        for entry in manifests:
+            if cancel and cancel():
+                break
             try:
-                with open(os.path.join(lib, fname), "r", encoding="utf-8", errors="ignore") as f:
-                    game = _parse_acf(f.read())
-                if game and game["appid"] not in seen:
+                st = entry.stat()
+            except OSError:
+                progress.step()
+                continue
+            old = self.entries.get(entry.path)
+            if old and old["mtime"] == st.st_mtime_ns and old["size"] == st.st_size:
+                found[entry.path] = old
+            else:
+                reparsed += 1
+                found[entry.path] = {"mtime": st.st_mtime_ns, "size": st.st_size,
+                                     "game": _parse_manifest(entry.path, lib)}
+            emit(found[entry.path]["game"])
+            progress.step()
+        return found, reparsed
+
+    def scan(self, steam_path=None, on_game=None, on_progress=None, cancel=None):
+        """
+        Atualiza o índice e retorna:
+          { "games": [...], "added": [...], "removed": [...], "reparsed": int }
+        `added`/`removed` são jogos (dicts) que apareceram/sumiram desde a
+        varredura anterior. Pode rodar fora da thread da GUI:
+          on_game(game)            — cada jogo assim que é encontrado
+          on_progress(feito, total) — manifests processados
+          cancel()                 — True interrompe; retorna None e o
+                                     índice fica como estava
+        """
+        with self._lock:
+            before  = {e["game"]["appid"]: e["game"] for e in self.entries.values() if e["game"]}
+            known   = set(self.entries)
+            seen, seen_lock = set(), threading.Lock()
+
+            def emit(game):
+                if game is None:
+                    return
+                with seen_lock:
+                    if game["appid"] in seen:
+                        return
                     seen.add(game["appid"])
-                    game["launch_cmd"] = f"steam://rungameid/{game['appid']}"
-                    games.append(game)
-            except:
-                pass
+                if on_game:
+                    on_game(game)
+
+            progress = _Progress(on_progress)
+            libs = library_folders(steam_path)
+            with ThreadPoolExecutor(max_workers=max(1, min(len(libs), MAX_SCAN_THREADS)),
+                                    thread_name_prefix="steam-scan") as pool:
+                parts = list(pool.map(
+                    lambda lib: self._scan_library(lib, progress, emit, cancel), libs))
+            if cancel and cancel():
+                return None
+
+            current, reparsed = {}, 0
+            for found, n in parts:
+                current.update(found)
+                reparsed += n
+            self.entries = current
+            if reparsed or set(current) != known:
+                self.save()
+
+        games, seen = [], set()
+        for e in current.values():
+            game = e["game"]
+            if game and game["appid"] not in seen:
+                seen.add(game["appid"])
+                games.append(game)
+        games.sort(key=lambda g: g["name"].lower())
+        return {
+            "games":    games,
+            "added":    [g for g in games if g["appid"] not in before],
+            "removed":  [g for a, g in before.items() if a not in seen],
+            "reparsed": reparsed,
+        }
+
+    def refresh_library(self, lib):
+        """
+        Reprocessa só uma pasta steamapps (usado pelo steam_watcher): lista
+        os manifests e reinterpreta apenas os novos/alterados. Retorna
+        { "added": [...], "removed": [...] } relativo a essa biblioteca.
+        """
+        with self._lock:
+            prefix = os.path.join(lib["steamapps"], "")
+            old    = {p: e for p, e in self.entries.items() if p.startswith(prefix)}
+            found, reparsed = self._scan_library(lib, _Progress(None), lambda g: None, None)
+            if not reparsed and set(found) == set(old):
+                return {"added": [], "removed": []}
+            for path in old:
+                self.entries.pop(path, None)
+            self.entries.update(found)
+            self.save()
+        before = {e["game"]["appid"] for e in old.values() if e["game"]}
+        now    = {e["game"]["appid"]: e["game"] for e in found.values() if e["game"]}
+        return {
+            "added":   [g for a, g in now.items() if a not in before],
+            "removed": [e["game"] for e in old.values()
+                        if e["game"] and e["game"]["appid"] not in now],
+        }
 
-    return sorted(games, key=lambda g: g["name"].lower())
+
+_index = None
+
+_index_lock = threading.Lock()
+
+def index():
+    """Índice persistente do processo (carregado sob demanda)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ScanIndex()
+        return _index
+
+def rescan(steam_path=None, on_game=None, on_progress=None, cancel=None):
+    """Varredura incremental usando o índice persistente (ver ScanIndex.scan)."""
+    return index().scan(steam_path, on_game, on_progress, cancel)
+
+
+def scan_steam_games(steam_path=None):
+    """
+    Retorna lista de dicts:
+      { "name": str, "appid": str, "launch_cmd": str, "installdir": str,
+        "install_path": str, "library": str, "size_on_disk": int,
+        "last_updated": int, "state_flags": int }
+    """
+    return rescan(steam_path)["games"]
@@ -0,0 +1,130 @@
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+import steam_scanner, os, threading
+
+
+SETTLE_MS = 1500     # o Steam grava o manifest várias vezes durante a instalação
+POLL_MS   = 30000    # fallback: intervalo de checagem do mtime das pastas
+
+
+class _WatchSignals(QObject):
+    done = pyqtSignal(list, list)      # jogos adicionados, removidos
+
+
+class SteamWatcher(QObject):
+    """
+    Observa as pastas steamapps de todas as bibliotecas (QFileSystemWatcher,
+    sem custo em repouso). Quando uma pasta muda, espera as gravações
+    assentarem e reprocessa só aquela biblioteca numa thread
+    (ScanIndex.refresh_library — apenas manifests novos/alterados são lidos).
+    Pastas que o sistema não deixa observar caem num polling leve do mtime
+    do diretório.
+    """
+    changed = pyqtSignal(list, list)   # jogos adicionados, removidos
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._libs    = {}       # steamapps normalizado → lib (library_folders)
+        self._pending = set()
+        self._polled  = {}       # steamapps → último mtime visto
+        self._watcher = None
+        self._busy    = False
+        self._signals = _WatchSignals()
+        self._signals.done.connect(self._on_done)
+
+        self._settle = QTimer(self)
+        self._settle.setSingleShot(True)
+        self._settle.setInterval(SETTLE_MS)
+        self._settle.timeout.connect(self._flush)
+        self._poll = QTimer(self)
+        self._poll.setInterval(POLL_MS)
+        self._poll.timeout.connect(self._check_polled)
+
+    # ── API ────────────────────────────────────────────────────────────────
+
+    def start(self):
+        self.stop()
+        libs = steam_scanner.library_folders()
+        self._libs = {os.path.normpath(l["steamapps"]): l
+                      for l in libs if os.path.isdir(l["steamapps"])}
+        if not self._libs:
+            return
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_dir_changed)
+        failed = self._watcher.addPaths(list(self._libs))
+        for path in failed:
+            self._polled[os.path.normpath(path)] = self._mtime(path)
+        if self._polled:
+            self._poll.start()
+        # Linha de base: sem ela, a 1ª mudança numa biblioteca nunca
+        # varrida mostraria todos os jogos dela como novos. Com o índice
+        # já preenchido isso só faz stat dos manifests — e o que mudou com
+        # o GameHub fechado (instalado/desinstalado) sai em `changed`,
+        # senão a varredura seguinte já não veria a diferença.
+        self._busy = True                 # _flush espera a linha de base
+        signals = self._signals
+
+        def baseline():
+            first  = not steam_scanner.index().entries   # índice vazio: tudo seria "novo"
+            result = steam_scanner.rescan()
+            signals.done.emit([] if first else result["added"], result["removed"])
+
+        threading.Thread(target=baseline, daemon=True, name="steam-watch-index").start()
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.deleteLater()
+            self._watcher = None
+        self._poll.stop()
+        self._settle.stop()
+        self._polled.clear()
+        self._pending.clear()
+
+    # ── Eventos ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _on_dir_changed(self, path):
+        self._pending.add(os.path.normpath(path))
+        self._settle.start()
+
+    def _check_polled(self):
+        for path, seen in self._polled.items():
+            mtime = self._mtime(path)
+            if mtime != seen:
+                self._polled[path] = mtime
+                self._on_dir_changed(path)
+
+    def _flush(self):
+        if self._busy:                 # ainda processando: tenta de novo depois
+            self._settle.start()
+            return
+        libs = [self._libs[p] for p in self._pending if p in self._libs]
+        self._pending.clear()
+        if not libs:
+            return
+        self._busy = True
+        signals = self._signals
+
+        def run():
+            added, removed = [], []
+            for lib in libs:
+                result = steam_scanner.index().refresh_library(lib)
+                added   += result["added"]
+                removed += result["removed"]
+            # Saiu de uma biblioteca e entrou em outra: foi movido, não mudou
+            moved   = {g["appid"] for g in added} & {g["appid"] for g in removed}
+            added   = [g for g in added   if g["appid"] not in moved]
+            removed = [g for g in removed if g["appid"] not in moved]
+            signals.done.emit(added, removed)
+
+        threading.Thread(target=run, daemon=True, name="steam-watch").start()
+
+    def _on_done(self, added, removed):
+        self._busy = False
+        if added or removed:
+            self.changed.emit(added, removed)
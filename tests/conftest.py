@@ -0,0 +1,4 @@
+import os, sys
+
+# Os módulos do app ficam soltos na raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
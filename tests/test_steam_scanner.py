@@ -0,0 +1,48 @@
+import os
+import pytest
+from benchmark import make_fake_steam
+import steam_scanner
+
+
+@pytest.fixture
+def steam(tmp_path):
+    # Apps 10..13: layout antigo, pasta <appid>/, subpasta de hash e sem arte
+    root  = make_fake_steam(str(tmp_path / "steam"), 4, libraries=1, artwork=True)
+    cache = steam_scanner.librarycache_path(root)
+    # 11 também tem um arquivo solto antigo: o da pasta <appid>/ deve vencer
+    open(os.path.join(cache, "11_library_600x900.jpg"), "wb").close()
+    return root, cache
+
+
+def _relative(art, cache):
+    return {appid: {field: os.path.relpath(path, cache).replace(os.sep, "/")
+                    for field, path in fields.items()}
+            for appid, fields in art.items()}
+
+
+def test_local_artwork_layouts(steam):
+    root, cache = steam
+    art = steam_scanner.local_artwork(["10", "11", "12"], root)
+    assert _relative(art, cache) == {
+        "10": {"icon_path":   "10_library_600x900.jpg",
+               "banner_path": "10_library_hero.jpg"},
+        "11": {"icon_path":   "11/library_600x900.jpg",
+               "banner_path": "11/header.jpg"},
+        "12": {"icon_path":   "12/3f2a9c/library_600x900_2x.jpg",
+               "banner_path": "12/3f2a9c/library_hero.jpg"},
+    }
+
+
+def test_local_artwork_folder_wins_over_flat_file(steam):
+    root, cache = steam
+    art = steam_scanner.local_artwork(["11"], root)
+    assert art["11"]["icon_path"] == os.path.join(cache, "11", "library_600x900.jpg")
+
+
+def test_local_artwork_omits_apps_without_art(steam):
+    root, _ = steam
+    assert steam_scanner.local_artwork(["13", "99"], root) == {}
+
+
+def test_local_artwork_without_librarycache(tmp_path):
+    assert steam_scanner.local_artwork(["10"], str(tmp_path / "sem_steam")) == {}
@@ -0,0 +1,108 @@
+from PyQt6.QtGui import QImage, QImageReader
+import settings_manager, hashlib, os, threading
+
+THUMB_DIR = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")),
+                         "GameHub", "thumbs")
+
+GC_EVERY = 50          # roda a coleta de lixo a cada N miniaturas gravadas
+
+_lock       = threading.Lock()
+_stores     = 0
+_gc_running = False
+
+
+def _thumb_path(key):
+    """
+    A chave do artwork_cache já contém caminho, mtime e tamanho do arquivo
+    original — se ele mudar, o hash muda e a miniatura velha simplesmente
+    deixa de ser usada (e depois é apagada pela coleta de lixo).
+    """
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(THUMB_DIR, digest[:2], digest + ".thumb")
+
+
+def load(key):
+    """Lê a miniatura pré-redimensionada; QImage nula se não existir."""
+    path = _thumb_path(key)
+    if not os.path.exists(path):
+        return QImage()
+    img = QImageReader(path).read()     # formato detectado pelo conteúdo
+    if not img.isNull():
+        try:
+            os.utime(path)              # marca como usada (LRU da coleta)
+        except OSError:
+            pass
+    return img
+
+
+def store(key, img):
+    """Grava a miniatura (PNG se tiver transparência, JPEG se não)."""
+    global _stores
+    path = _thumb_path(key)
+    tmp  = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fmt, quality = ("PNG", -1) if img.hasAlphaChannel() else ("JPG", 92)
+        if img.save(tmp, fmt, quality):
+            os.replace(tmp, path)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    with _lock:
+        _stores += 1
+        run_gc = _stores % GC_EVERY == 0
+    if run_gc:
+        collect_garbage_async()
+
+
+def collect_garbage(limit_mb=None):
+    """Apaga as miniaturas menos usadas até caber no limite (thumb_cache_mb)."""
+    if limit_mb is None:
+        limit_mb = settings_manager.get("thumb_cache_mb", 256)
+    limit = int(limit_mb) * 1024 * 1024
+    entries, total = [], 0
+    for root, _, files in os.walk(THUMB_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith(".tmp"):
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def collect_garbage_async():
+    """Roda collect_garbage numa thread em segundo plano (uma por vez)."""
+    global _gc_running
+    limit_mb = settings_manager.get("thumb_cache_mb", 256)
+    with _lock:
+        if _gc_running:
+            return
+        _gc_running = True
+
+    def run():
+        global _gc_running
+        try:
+            collect_garbage(limit_mb)
+        finally:
+            with _lock:
+                _gc_running = False
+
+    threading.Thread(target=run, daemon=True, name="thumbs-gc").start()
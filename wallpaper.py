@@ -0,0 +1,270 @@
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, QSize, pyqtSignal
+from PyQt6.QtGui import QPixmap, QImageReader, QMovie
+from artwork_cache import scaled_size, EXPAND
+from animation_service import MIN_DELAY
+import settings_manager, frame_clock, performance
+
+
+SETTLE_MS = 200     # espera o tamanho da janela parar de mudar antes de reescalar
+
+
+class _FramesSignals(QObject):
+    done = pyqtSignal(int, object)     # geração, [(QImage, delay)] | None
+
+
+class _ScaleSignals(QObject):
+    done = pyqtSignal(int, object, object)   # geração, QImage original, QImage escalada
+
+
+class _FramesTask(QRunnable):
+    """
+    Decodifica todos os frames do GIF já no tamanho da janela, numa thread
+    do pool. Se o loop inteiro não couber no orçamento devolve None.
+    """
+    def __init__(self, gen, path, size, dpr, budget, signals):
+        super().__init__()
+        self.gen, self.path, self.size, self.dpr = gen, path, size, dpr
+        self.budget  = budget
+        self.signals = signals
+
+    def run(self):
+        reader = QImageReader(self.path)
+        reader.setScaledSize(self.size)
+        frames, used = [], 0
+        while True:
+            img = reader.read()
+            if img.isNull():
+                break
+            used += img.sizeInBytes()
+            if used > self.budget:
+                frames = None
+                break
+            img.setDevicePixelRatio(self.dpr)
+            frames.append((img, max(MIN_DELAY, reader.nextImageDelay())))
+        try:
+            self.signals.done.emit(self.gen, frames or None)
+        except RuntimeError:      # wallpaper trocado/destruído no meio do caminho
+            pass
+
+
+class _ScaleTask(QRunnable):
+    """
+    Redimensiona o wallpaper estático (SmoothTransformation, ou Fast no
+    perfil de baixo consumo) numa thread do pool. O original é decodificado
+    uma vez só (na primeira tarefa) e reaproveitado nas seguintes.
+    """
+    def __init__(self, gen, path, source, size, dpr, mode, signals):
+        super().__init__()
+        self.gen, self.path, self.source = gen, path, source
+        self.size, self.dpr, self.mode = size, dpr, mode
+        self.signals = signals
+
+    def run(self):
+        source = self.source
+        if source is None:
+            source = QImageReader(self.path).read()
+        scaled = None
+        if not source.isNull():
+            scaled = source.scaled(self.size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                   self.mode)
+            scaled.setDevicePixelRatio(self.dpr)
+        try:
+            self.signals.done.emit(self.gen, source, scaled)
+        except RuntimeError:      # wallpaper trocado/destruído no meio do caminho
+            pass
+
+
+class _Wallpaper(QObject):
+    """
+    Base dos wallpapers: guarda o tamanho da janela e reconstrói a imagem
+    (_rebuild, nas subclasses) só depois que o redimensionamento assenta.
+    O frame emitido cobre a janela (KeepAspectRatioByExpanding); o QLabel
+    de destino centraliza e corta o excesso.
+    """
+    frame_ready = pyqtSignal(QPixmap)
+
+    def __init__(self, path, size, dpr=1.0, parent=None):
+        super().__init__(parent)
+        self.path    = path
+        self._dpr    = dpr
+        self._size   = QSize(size)
+        self._gen    = 0
+        self._src_size = QImageReader(path).size()
+        self._pool   = QThreadPool.globalInstance()
+        self._settle = QTimer(self)
+        self._settle.setSingleShot(True)
+        self._settle.setInterval(SETTLE_MS)
+        self._settle.timeout.connect(self._rebuild)
+
+    # ── API ────────────────────────────────────────────────────────────────
+
+    def resize(self, size):
+        """Agenda a reconstrução quando o tamanho assentar."""
+        self._size = QSize(size)
+        self._settle.start()
+
+    def stop(self):
+        self._gen += 1           # descarta resultados em andamento
+        self._settle.stop()
+
+    def _target_size(self):
+        return scaled_size(self._src_size, self._size.width(), self._size.height(),
+                           self._dpr, EXPAND)
+
+
+class StaticWallpaper(_Wallpaper):
+    """
+    Wallpaper de imagem estática (ou só o 1º frame de um GIF, no perfil de
+    baixo consumo) com redimensionamento em duas etapas:
+    durante o arraste só estica o último frame (FastTransformation, barato);
+    quando o tamanho assenta, refaz a versão suave numa thread do pool a
+    partir do original já decodificado — nada de decodificar o arquivo de
+    novo a cada resize.
+    """
+    def __init__(self, path, size, dpr=1.0, parent=None):
+        super().__init__(path, size, dpr, parent)
+        self._source = None      # QImage original (decodificada uma vez)
+        self._last   = None      # último QPixmap de alta qualidade
+        self._signals = _ScaleSignals()
+        self._signals.done.connect(self._on_scaled)
+        self._rebuild()
+
+    def resize(self, size):
+        super().resize(size)
+        target = self._target_size()
+        if self._last is not None and target is not None:
+            fast = self._last.scaled(target, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                     Qt.TransformationMode.FastTransformation)
+            fast.setDevicePixelRatio(self._dpr)
+            self.frame_ready.emit(fast)
+
+    def _rebuild(self):
+        size = self._target_size()
+        if size is None:
+            return
+        if self._last is not None and self._last.size() == size:
+            self.frame_ready.emit(self._last)   # volta ao tamanho já pronto
+            return
+        self._gen += 1
+        self._pool.start(_ScaleTask(self._gen, self.path, self._source, size,
+                                    self._dpr, performance.transform(), self._signals))
+
+    def _on_scaled(self, gen, source, scaled):
+        if gen != self._gen or scaled is None:
+            return
+        self._source = source
+        self._last   = QPixmap.fromImage(scaled)
+        self.frame_ready.emit(self._last)
+
+
+class GifWallpaper(_Wallpaper):
+    """
+    Wallpaper GIF com os frames pré-escalados para o tamanho da janela.
+    Os frames são gerados fora da thread da GUI uma vez por tamanho (depois
+    que o redimensionamento assenta) e ficam em memória dentro do orçamento
+    wallpaper_cache_mb — cada frame do loop vira só um setPixmap.
+    Se não couber, cai para um QMovie com setScaledSize (o decoder escala).
+    Durante o arraste do resize o loop continua, com cada frame só esticado
+    (FastTransformation) até os frames do novo tamanho chegarem.
+    """
+    def __init__(self, path, size, dpr=1.0, parent=None):
+        super().__init__(path, size, dpr, parent)
+        self._frames = []        # [(QPixmap, delay)]
+        self._index  = 0
+        self._movie  = None
+        self._due    = 0         # instante (ms do relógio) do próximo frame
+        self._stretch = None     # tamanho novo ainda sem frames prontos
+        self._signals = _FramesSignals()
+        self._signals.done.connect(self._on_frames)
+        self._rebuild()
+
+    def stop(self):
+        super().stop()
+        frame_clock.clock().remove(self)
+        if self._movie:
+            self._movie.stop()
+        self._frames = []
+
+    # ── Construção dos frames ──────────────────────────────────────────────
+
+    def resize(self, size):
+        super().resize(size)
+        self._stretch = self._target_size()
+        pix = self._current_pixmap()
+        if pix is not None:
+            self._emit(pix)
+
+    def _rebuild(self):
+        size = self._target_size()
+        if size is None:
+            return
+        self._gen += 1
+        if self._frames and self._frames[0][0].size() == size:
+            self._stretch = None          # volta ao tamanho já pronto
+            self._emit(self._frames[self._index][0])
+            return
+        budget = settings_manager.get("wallpaper_cache_mb", 192) * 1024 * 1024
+        self._pool.start(_FramesTask(self._gen, self.path, size, self._dpr,
+                                     budget, self._signals))
+
+    def _on_frames(self, gen, frames):
+        if gen != self._gen:
+            return               # resultado de um tamanho antigo
+        if self._movie:
+            self._movie.stop()
+            self._movie = None
+        self._stretch = None
+        if frames is None:
+            self._frames = []
+            movie = self._movie = QMovie(self.path)
+            movie.setScaledSize(self._target_size())    # pixels físicos
+            movie.frameChanged.connect(self._on_movie_frame)
+            movie.start()
+            return
+        # Conversão QImage → QPixmap só na thread da GUI
+        self._frames = [(QPixmap.fromImage(img), delay) for img, delay in frames]
+        self._index  = self._index % len(self._frames)
+        self._show_current()
+
+    # ── Reprodução ─────────────────────────────────────────────────────────
+
+    def _current_pixmap(self):
+        if self._frames:
+            return self._frames[self._index][0]
+        if self._movie:
+            pix = self._movie.currentPixmap()
+            pix.setDevicePixelRatio(self._dpr)     # como os frames do cache
+            return pix
+        return None
+
+    def _emit(self, pix):
+        """Emite o frame — esticado (Fast) se o tamanho novo ainda não tem frames."""
+        size = self._stretch
+        if size is not None and pix.size() != size:
+            pix = pix.scaled(size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                             Qt.TransformationMode.FastTransformation)
+            pix.setDevicePixelRatio(self._dpr)
+        self.frame_ready.emit(pix)
+
+    def _on_movie_frame(self, _):
+        if self._movie is not None:
+            self._emit(self._current_pixmap())
+
+    def _show_current(self):
+        pix, delay = self._frames[self._index]
+        self._emit(pix)
+        if len(self._frames) > 1:
+            clock = frame_clock.clock()
+            self._due = clock.now() + delay
+            clock.add(self)
+
+    def tick(self, now):
+        """Chamado pelo frame_clock; avança o loop no mesmo quadro dos cards."""
+        if not self._frames:
+            return False
+        if now >= self._due:
+            self._index = (self._index + 1) % len(self._frames)
+            pix, delay  = self._frames[self._index]
+            self._emit(pix)
+            self._due = max(self._due + delay, now)
+        return True